@@ -1,12 +1,25 @@
 import streamlit as st
+import hashlib
+import json
+import os
 from streamlit_option_menu import option_menu
 from src.utils.parser import extract_text_from_pdf, extract_candidate_info, extract_jd_skills
-from src.utils.ats import calculate_ats_score, ats_dashboard
+from src.utils.ats import calculate_ats_score
+from src.utils.dashboard import ats_dashboard
 from src.utils.assessment import run_assessment
+from src.utils.pipeline import ReviewStore, start_screening
+from src.utils.resources import PRELOAD_RESOURCES, warm_up
+from src.helpers import tracing
 
 #-------Resume Screening and Technical Assessment System-----------
 st.set_page_config(page_title="TalentScout", layout="wide")
 
+if PRELOAD_RESOURCES:
+    warm_up(background=True)
+
+if tracing.enabled() and os.environ.get("TRACE_METRICS_PORT"):
+    tracing.start_metrics_server(int(os.environ["TRACE_METRICS_PORT"]))
+
 if "view_mode" not in st.session_state:
     st.session_state.view_mode = "home"
 
@@ -30,6 +43,7 @@ if new_view_mode != st.session_state.view_mode:
     st.session_state.questions = []
     st.session_state.answers = []
     st.session_state.grades = []
+    st.session_state.grade_jobs = []
     
     if "resume_text" in st.session_state: del st.session_state.resume_text
     if "jd_text" in st.session_state: del st.session_state.jd_text
@@ -43,9 +57,20 @@ if new_view_mode != st.session_state.view_mode:
     st.session_state.view_mode = new_view_mode
     st.rerun() 
 
-@st.cache_data
-def cached_extract_text_from_pdf(uploaded_file):
-    return extract_text_from_pdf(uploaded_file)
+@st.cache_data(max_entries=64)
+def cached_extract_text_from_pdf(pdf_bytes):
+    return extract_text_from_pdf(pdf_bytes)
+
+@st.cache_data(max_entries=128, show_spinner="Analysing your resume...")
+def cached_ats_score(resume_info, jd_info, text):
+    return calculate_ats_score(resume_info, jd_info, text)
+
+@st.cache_resource
+def resume_reviews():
+    return ReviewStore(max_entries=128)
+
+def review_key(resume_info, jd_info):
+    return hashlib.sha256(json.dumps([resume_info, jd_info], sort_keys=True).encode("utf-8")).hexdigest()
 
 # ----------------- HOME PAGE -----------------
 
@@ -67,9 +92,8 @@ elif st.session_state.view_mode == "ats":
         if not uploaded_file or not jd:
             st.warning("Please upload a resume and paste the Job Description.")
         else:
-            st.session_state.text = cached_extract_text_from_pdf(uploaded_file)
-            st.session_state.resume_text = extract_candidate_info(st.session_state.text)
-            st.session_state.jd_text = extract_jd_skills(jd)
+            job = start_screening(uploaded_file.getvalue(), jd)
+            st.session_state.text, st.session_state.resume_text, st.session_state.jd_text = job.result()
             st.session_state.confirmed = False
 
     if "resume_text" in st.session_state and not st.session_state.confirmed:
@@ -86,10 +110,10 @@ elif st.session_state.view_mode == "ats":
             st.warning("Please update your resume or enter corrections manually.")
 
     if st.session_state.get("confirmed", False):
-        resume_text = st.session_state.resume_text
-        jd = st.session_state.jd_text
-        ats, info = calculate_ats_score(st.session_state.resume_text, st.session_state.jd_text, st.session_state.text)
-        ats_dashboard(ats, info, resume_text, jd)
+        ats, info = cached_ats_score(st.session_state.resume_text, st.session_state.jd_text, st.session_state.text)
+        key = review_key(st.session_state.resume_text, st.session_state.jd_text)
+        review = resume_reviews().get(key, st.session_state.resume_text, st.session_state.jd_text)
+        ats_dashboard(ats, info, review)
 
 # ----------------- TECHNICAL ASSESSMENT ON RESUME -----------------
 
@@ -102,7 +126,7 @@ elif st.session_state.view_mode == "technical1":
         if not uploaded_file:
             st.warning("Please paste the Job Description.")
         else:
-            st.session_state.text2 = cached_extract_text_from_pdf(uploaded_file)
+            st.session_state.text2 = cached_extract_text_from_pdf(uploaded_file.getvalue())
             st.session_state.resume_text2 = extract_candidate_info(st.session_state.text2)
             st.session_state.tech_stack2 =st.session_state.resume_text2.get("Tech Stack", "Python")
             st.session_state.confirmed2 = False
@@ -139,3 +163,11 @@ elif st.session_state.view_mode == "technical2":
 
     if "jd_text2" in st.session_state:
         run_assessment("technical2", st.session_state.jd_tech_stack2, prefix="answer_jd")
+
+# ----------------- DEBUG PANEL -----------------
+
+if tracing.enabled():
+    with st.sidebar.expander("Stage timings"):
+        st.dataframe(tracing.stage_summary(), hide_index=True)
+        st.caption("Most recent spans")
+        st.dataframe(tracing.recent_spans(20)[::-1], hide_index=True)
@@ -0,0 +1,67 @@
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.candidate_index import CandidateIndex
+
+
+def build(root, candidates, skills_per_candidate, vocab_size, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    index = CandidateIndex(root, dim)
+
+    def encode(skills):
+        return rng.standard_normal((len(skills), dim)).astype(np.float32)
+
+    start = time.perf_counter()
+    for i in range(candidates):
+        count = max(1, int(rng.poisson(skills_per_candidate)))
+        # popular skills are shared by many candidates, like Python or SQL
+        skills = [f"skill-{j}" for j in np.minimum(rng.zipf(1.3, count), vocab_size) - 1]
+        index.add_skills(f"cand-{i}", skills, encode)
+    return index, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Top-K query latency of the candidate index.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--skills", type=int, default=12, help="mean skills per candidate")
+    parser.add_argument("--vocab", type=int, default=5000, help="distinct canonical skills")
+    parser.add_argument("--jd-skills", type=int, default=10)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as root:
+            index, build_seconds = build(root, size, args.skills, args.vocab, args.dim)
+            # one untimed query pages the matrix in
+            index.rank(rng.standard_normal((args.jd_skills, args.dim)), args.k)
+            latencies = []
+            for _ in range(args.queries):
+                jd = rng.standard_normal((args.jd_skills, args.dim))
+                start = time.perf_counter()
+                index.rank(jd, args.k)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            print(json.dumps({
+                "candidates": size,
+                "skill_rows": index.rows,
+                "vocab": len(index.vocab_skills),
+                "index_mb": round(sum(p.stat().st_size for p in Path(root).iterdir()) / 2**20, 1),
+                "build_seconds": round(build_seconds, 2),
+                "query_p50_ms": round(statistics.median(latencies) * 1000, 2),
+                "query_p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2),
+            }), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.utils.resources import SBERT_MODEL_NAME, get_skill_normalizer
+
+
+def vocabulary():
+    # every canonical skill and alias, plus a few spellings resumes use that the normalizer does not know
+    skills = [term for canonical, aliases in get_skill_normalizer().items() for term in [canonical] + aliases]
+    skills += ["Machine Learning", "Deep Learning", "Computer Vision", "Data Visualization", "REST APIs",
+               "Linux", "Spark", "Hadoop", "MongoDB", "CI/CD", "Statistics", "Time Series"]
+    return list(dict.fromkeys(skills))
+
+
+def _rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+def measure(backend, model_name, out_path, repeats):
+    # runs in a fresh interpreter so resident memory belongs to this backend alone
+    from src.utils.resources import load_sbert_model
+
+    skills = vocabulary()
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    model = load_sbert_model(backend, model_name)
+    load_seconds = time.perf_counter() - start
+    model.encode(skills[:8], convert_to_numpy=True)
+
+    latencies = []
+    rng = random.Random(0)
+    for _ in range(repeats):
+        sample = rng.sample(skills, 6)
+        start = time.perf_counter()
+        model.encode(sample, convert_to_numpy=True)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    start = time.perf_counter()
+    embeddings = model.encode(skills, convert_to_numpy=True, batch_size=64)
+    throughput = len(skills) / (time.perf_counter() - start)
+    np.save(out_path, embeddings.astype(np.float32))
+    return {
+        "backend": backend,
+        "load_seconds": round(load_seconds, 2),
+        "rss_mb": round(_rss_mb(), 1),
+        "model_rss_mb": round(_rss_mb() - rss_before, 1),
+        "p50_ms_6_skills": round(1000 * latencies[len(latencies) // 2], 2),
+        "p95_ms_6_skills": round(1000 * latencies[int(0.95 * (len(latencies) - 1))], 2),
+        "texts_per_second": round(throughput, 1),
+    }
+
+
+def matches(embeddings, pairs, threshold):
+    unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    results = []
+    for resume, jd in pairs:
+        best = (unit[resume] @ unit[jd].T).max(axis=0)
+        results.append(frozenset(np.asarray(jd)[best >= threshold].tolist()))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency, throughput, memory and match parity of the encoder backends.")
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "onnx"])
+    parser.add_argument("--model", default=SBERT_MODEL_NAME)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--pairs", type=int, default=2000, help="random resume/JD skill lists for the parity check")
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.backends[0], args.model, args.child, args.repeats)))
+        return
+
+    skills = vocabulary()
+    rng = random.Random(1)
+    pairs = [(rng.sample(range(len(skills)), rng.randint(3, 15)), rng.sample(range(len(skills)), rng.randint(3, 10)))
+             for _ in range(args.pairs)]
+
+    reference = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            out_path = Path(tmp) / f"{backend}.npy"
+            proc = subprocess.run([sys.executable, __file__, "--child", str(out_path), "--backends", backend,
+                                   "--model", args.model, "--repeats", str(args.repeats)],
+                                  capture_output=True, text=True, cwd=ROOT)
+            if proc.returncode != 0:
+                print(json.dumps({"backend": backend, "error": proc.stderr.strip().splitlines()[-1]}), flush=True)
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            found = matches(np.load(out_path), pairs, args.threshold)
+            if reference is None:
+                reference = found
+            # parity is against the first backend that ran, normally torch
+            result["identical_match_sets"] = round(sum(a == b for a, b in zip(found, reference)) / len(pairs), 4)
+            print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.encoder import BatchingEncoder
+
+SKILLS = ("Python SQL PyTorch TensorFlow Docker Kubernetes AWS GCP Azure Pandas NumPy Flask Django FastAPI "
+          "Tableau Excel Git Java C++ Spark Kafka Airflow Redis MongoDB PostgreSQL React Node.js").split()
+
+
+class StubModel:
+    # a fixed cost per forward pass plus a cost per text, roughly how a small transformer behaves on CPU
+    def __init__(self, call_ms, text_ms, dim=384):
+        self.call = call_ms / 1000
+        self.text = text_ms / 1000
+        self.dim = dim
+        self.lock = threading.Lock()
+
+    def encode(self, texts, convert_to_numpy=True, batch_size=32):
+        with self.lock:
+            time.sleep(self.call + self.text * len(texts))
+        return np.ones((len(texts), self.dim), dtype=np.float32)
+
+
+def run(encoder, concurrency, requests_per_user, skills_per_request, seed=0):
+    latencies = []
+    lock = threading.Lock()
+
+    def user(i):
+        rng = random.Random(seed + i)
+        for _ in range(requests_per_user):
+            texts = [f"{rng.choice(SKILLS)} {rng.randint(0, 999)}" for _ in range(skills_per_request)]
+            start = time.perf_counter()
+            encoder.encode(texts, convert_to_numpy=True)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests_per_second": round(len(latencies) / seconds, 1),
+        "p50_ms": round(1000 * latencies[len(latencies) // 2], 2),
+        "p95_ms": round(1000 * latencies[int(0.95 * (len(latencies) - 1))], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode throughput versus concurrency, with and without micro-batching.")
+    parser.add_argument("--model", choices=["stub", "sbert"], default="stub")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=20, help="encode calls per simulated user")
+    parser.add_argument("--skills", type=int, default=6, help="texts per encode call")
+    parser.add_argument("--window-ms", type=float, nargs="+", default=[2, 5, 10])
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--stub-call-ms", type=float, default=8, help="stub cost per forward pass")
+    parser.add_argument("--stub-text-ms", type=float, default=0.3, help="stub cost per text")
+    args = parser.parse_args()
+
+    if args.model == "sbert":
+        from src.utils.resources import get_sbert_model
+        model = get_sbert_model()
+        model.encode(SKILLS)
+    else:
+        model = StubModel(args.stub_call_ms, args.stub_text_ms)
+
+    for concurrency in args.concurrency:
+        result = run(model, concurrency, args.requests, args.skills)
+        print(json.dumps({"variant": "direct", "concurrency": concurrency, **result}), flush=True)
+        for window in args.window_ms:
+            encoder = BatchingEncoder(model, window, args.max_batch)
+            result = run(encoder, concurrency, args.requests, args.skills)
+            print(json.dumps({"variant": f"batched {window:g}ms", "concurrency": concurrency, **result,
+                              "mean_batch": round(encoder.batched_texts / max(encoder.batches, 1), 1)}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
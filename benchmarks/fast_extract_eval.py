@@ -0,0 +1,101 @@
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.parser import DISALLOWED_CHARS, extract_text_from_pdf, extract_candidate_info
+from src.utils.fast_extract import CANDIDATE_FIELDS, extract_by_rules, extract_candidate_info_fast
+from src.utils.ats import normalize_skills
+
+
+def load_fixtures(paths):
+    fixtures = []
+    for path in map(Path, paths):
+        files = sorted(p for p in path.rglob("*") if p.suffix in (".pdf", ".txt")) if path.is_dir() else [path]
+        for file in files:
+            if file.suffix == ".pdf":
+                with open(file, "rb") as f:
+                    text = extract_text_from_pdf(f, parallel=False)
+            else:
+                # same character set the PDF path leaves behind
+                text = DISALLOWED_CHARS.sub("", file.read_text())
+            # keyed by file name, so a saved reference works from any working directory
+            fixtures.append((file.name, text))
+    return fixtures
+
+
+def _skills(info):
+    return set(normalize_skills([s for s in str(info.get("Tech Stack") or "").split(", ") if s.strip()]))
+
+
+def _same(field, a, b):
+    if a is None or b is None:
+        return a is None and b is None
+    a, b = str(a).strip(), str(b).strip()
+    if field == "Phone Number":
+        return re.sub(r"\D", "", a)[-10:] == re.sub(r"\D", "", b)[-10:]
+    if field == "Years of Experience":
+        a, b = re.findall(r"\d+(?:\.\d+)?", a), re.findall(r"\d+(?:\.\d+)?", b)
+        return bool(a and b) and float(a[0]) == float(b[0])
+    return a.lower() == b.lower()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the rule-based resume extractor with the LLM extractor.")
+    parser.add_argument("fixtures", nargs="+", help="PDF or .txt resumes, or directories of them")
+    parser.add_argument("--reference", help="JSON file of LLM results per fixture; created on first run, reused after")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    reference = {}
+    if args.reference and Path(args.reference).exists():
+        reference = json.loads(Path(args.reference).read_text())
+
+    start = time.perf_counter()
+    llm_runs = 0
+    for name, text in fixtures:
+        if name not in reference:
+            reference[name] = extract_candidate_info(text)
+            llm_runs += 1
+    llm_seconds = time.perf_counter() - start
+    if args.reference:
+        Path(args.reference).write_text(json.dumps(reference, indent=2))
+
+    start = time.perf_counter()
+    rules = {name: extract_candidate_info_fast(text, llm_fallback=False) for name, text in fixtures}
+    rule_seconds = time.perf_counter() - start
+
+    true_positive = predicted = expected = 0
+    exact = {field: 0 for field in ("Email Address", "Phone Number", "Years of Experience")}
+    filled = {field: 0 for field in CANDIDATE_FIELDS}
+    for name, text in fixtures:
+        fast, llm = rules[name], reference[name]
+        fast_skills, llm_skills = _skills(fast), _skills(llm)
+        true_positive += len(fast_skills & llm_skills)
+        predicted += len(fast_skills)
+        expected += len(llm_skills)
+        for field in exact:
+            exact[field] += _same(field, fast.get(field), llm.get(field))
+        for field in extract_by_rules(text):
+            filled[field] += 1
+
+    n = max(len(fixtures), 1)
+    print(json.dumps({
+        "fixtures": len(fixtures),
+        "tech_stack_precision": round(true_positive / predicted, 3) if predicted else None,
+        "tech_stack_recall": round(true_positive / expected, 3) if expected else None,
+        "exact_match": {field: round(count / n, 3) for field, count in exact.items()},
+        # fields the rules leave empty are the ones that still go to the LLM in the default mode
+        "filled_by_rules": {field: round(count / n, 3) for field, count in filled.items()},
+        "rule_seconds_per_resume": round(rule_seconds / n, 5),
+        # None when every result came from --reference
+        "llm_seconds_per_resume": round(llm_seconds / llm_runs, 3) if llm_runs else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+FLOWS = ["ats", "technical1", "technical2"]
+JD_TEXT = """We are hiring a Machine Learning Engineer with 1+ years of experience.
+Required: Python, SQL, TensorFlow, Kubernetes, GCP. Nice to have: Docker, Airflow, NLP.
+You will build and deploy models, own data pipelines and work closely with product teams."""
+ANSWER = ("It keeps lookups fast by trading memory for time. I used one to cache model features in a project, "
+          "which cut request latency by about 40 percent, though invalidation needed care.")
+
+
+def _peak_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+def percentile(sorted_values, q):
+    return sorted_values[int(q * (len(sorted_values) - 1))]
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def timed(self, stage, fn, *args):
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+        except Exception:
+            with self.lock:
+                self.errors[stage] += 1
+            raise
+        with self.lock:
+            self.samples[stage].append(time.perf_counter() - start)
+        return result
+
+
+def run_worker(args, worker):
+    # one worker is one app process: its simulated users share the model, caches and thread pools
+    from pdf_throughput import make_pdf
+    from stand_ins import StubEmbeddingModel, ensure_readability
+    from src.helpers.pdf_report import generate_pdf_report
+    from src.utils import resources
+    from src.utils.assessment import TOTAL_QUESTIONS, QuestionPrefetcher, submit_grade, resolve_grade
+    from src.utils.ats import calculate_ats_score, stream_resume_review
+    from src.utils.parser import extract_text_from_pdf, extract_candidate_info, extract_jd_skills
+    from src.utils.pipeline import start_screening
+
+    start = time.perf_counter()
+    if args.model == "stub":
+        resources._resources["sbert_model"] = StubEmbeddingModel()
+    ensure_readability()
+    resources.warm_up()
+    # semantic_skill_match imports this on first use; a live host has long since paid for it
+    import sentence_transformers.util
+    startup_seconds = time.perf_counter() - start
+    recorder = Recorder()
+
+    def grade_all(jobs):
+        grades = []
+        for job in jobs:
+            grade, error = resolve_grade(job)
+            if grade is None:
+                # the app shows no report until every answer is graded
+                raise RuntimeError(error)
+            grades.append(grade)
+        return grades
+
+    def assessment(tech_stack):
+        prefetcher = recorder.timed("question_prefetch", QuestionPrefetcher, tech_stack)
+        questions, jobs = [], []
+        for q_number in range(1, TOTAL_QUESTIONS + 1):
+            questions.append(recorder.timed("question", prefetcher.get, q_number))
+            time.sleep(args.think_time)
+            jobs.append(submit_grade(questions[-1], ANSWER))
+        grades = recorder.timed("grading", grade_all, jobs)
+        recorder.timed("generate_pdf_report", generate_pdf_report, questions, [ANSWER] * len(questions), grades)
+
+    def ats(pdf):
+        text, resume_info, jd_info = recorder.timed("screening", lambda: start_screening(pdf, JD_TEXT).result())
+        recorder.timed("calculate_ats_score", calculate_ats_score, resume_info, jd_info, text)
+        recorder.timed("resume_review", lambda: "".join(stream_resume_review(resume_info, jd_info)))
+
+    def technical1(pdf):
+        text = recorder.timed("extract_text_from_pdf", extract_text_from_pdf, pdf)
+        info = recorder.timed("extract_candidate_info", extract_candidate_info, text)
+        assessment(info.get("Tech Stack", "Python"))
+
+    def technical2(pdf):
+        info = recorder.timed("extract_jd_skills", extract_jd_skills, JD_TEXT)
+        assessment(info.get("Tech Stack", "Python"))
+
+    flows = {"ats": ats, "technical1": technical1, "technical2": technical2}
+    sessions = defaultdict(int)
+    failed = defaultdict(int)
+
+    def user(index):
+        rng = random.Random(worker * 100003 + index)
+        for session in range(args.sessions):
+            flow = args.flows[(index + session) % len(args.flows)]
+            # every candidate uploads a different resume, so no cache answers for them
+            pdf = make_pdf(args.pages, rng.randrange(1 << 30))
+            try:
+                recorder.timed(f"session:{flow}", flows[flow], pdf)
+                outcome = sessions
+            except Exception:
+                outcome = failed
+            with recorder.lock:
+                outcome[flow] += 1
+
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(args.child_users)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "worker": worker,
+        "users": args.child_users,
+        "startup_seconds": round(startup_seconds, 2),
+        "wall_seconds": time.perf_counter() - start,
+        "sessions": dict(sessions),
+        "failed_sessions": dict(failed),
+        "samples": dict(recorder.samples),
+        "errors": dict(recorder.errors),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def run_level(args, users, base_url, scratch):
+    env = {
+        **os.environ,
+        "GROQ_BASE_URL": base_url,
+        "GROQ_API": os.environ.get("GROQ_API", "load-test"),
+        "LLM_CACHE": "1" if args.llm_cache else "0",
+        # a cold host: empty embedding cache, and an empty question bank that is not refilled
+        # in the background unless a filled one is given
+        "EMBEDDING_CACHE_DIR": str(Path(scratch) / "embeddings"),
+        "JD_STORE_DIR": str(Path(scratch) / "jd_profiles"),
+        "QUESTION_BANK_DIR": args.question_bank or str(Path(scratch) / "question_bank"),
+        "QUESTION_BANK_LOW_WATER": os.environ.get("QUESTION_BANK_LOW_WATER", "20") if args.question_bank else "0",
+        "PRELOAD_RESOURCES": "0",
+    }
+    procs = []
+    for worker in range(args.workers):
+        share = users // args.workers + (worker < users % args.workers)
+        if not share:
+            continue
+        command = [sys.executable, __file__, "--child", str(worker), "--child-users", str(share),
+                   "--sessions", str(args.sessions), "--flows", *args.flows, "--pages", str(args.pages),
+                   "--think-time", str(args.think_time), "--model", args.model]
+        procs.append(subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True))
+
+    workers = []
+    for proc in procs:
+        out, err = proc.communicate()
+        if proc.returncode != 0:
+            print(json.dumps({"users": users, "error": (err.strip().splitlines() or ["worker failed"])[-1]}), flush=True)
+            continue
+        workers.append(json.loads(out.strip().splitlines()[-1]))
+    if not workers:
+        return None
+
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    for result in workers:
+        for stage, values in result["samples"].items():
+            samples[stage].extend(values)
+        for stage, count in result["errors"].items():
+            errors[stage] += count
+    stages = {}
+    for stage in sorted(set(samples) | set(errors)):
+        values = sorted(samples[stage])
+        stages[stage] = {"count": len(values), "errors": errors[stage]}
+        if values:
+            stages[stage].update({f"p{int(q * 100)}_ms": round(1000 * percentile(values, q), 1) for q in (0.5, 0.95, 0.99)})
+
+    wall = max(result["wall_seconds"] for result in workers)
+    completed = sum(sum(result["sessions"].values()) for result in workers)
+    return {
+        "users": users,
+        "workers": len(workers),
+        "sessions": completed,
+        "failed_sessions": sum(sum(result["failed_sessions"].values()) for result in workers),
+        "wall_seconds": round(wall, 2),
+        "sessions_per_second": round(completed / wall, 3),
+        "stages": stages,
+        "peak_rss_mb": {result["worker"]: result["peak_rss_mb"] for result in workers},
+        "startup_seconds": {result["worker"]: result["startup_seconds"] for result in workers},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated candidates running the ATS and assessment flows against a mock LLM.")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 5, 10, 25, 50], help="concurrent users, one run per value")
+    parser.add_argument("--workers", type=int, default=1, help="app processes the users are spread over")
+    parser.add_argument("--sessions", type=int, default=3, help="flows each user runs back to back")
+    parser.add_argument("--flows", nargs="+", choices=FLOWS, default=FLOWS)
+    parser.add_argument("--pages", type=int, default=2, help="pages per uploaded resume")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds a user spends on each answer")
+    parser.add_argument("--model", choices=["sbert", "stub"], default="sbert", help="embedding model in the workers")
+    parser.add_argument("--llm-cache", action="store_true", help="keep the LLM response cache on")
+    parser.add_argument("--question-bank", help="use this question bank directory instead of an empty one")
+    parser.add_argument("--base-url", help="an already running LLM endpoint; by default a mock is started here")
+    parser.add_argument("--latency", type=float, default=0.3, help="mock: mean seconds per LLM response")
+    parser.add_argument("--jitter", type=float, default=0.1, help="mock: std dev of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock: fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="mock: fraction of 429 responses")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="mock: seconds between streamed chunks")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--child-users", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_worker(args, args.child)))
+        return
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        from mock_llm_server import start_server
+        server = start_server(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                              rate_limit_rate=args.rate_limit_rate, token_latency=args.token_latency)
+        base_url = server.base_url
+
+    levels = []
+    for users in args.users:
+        llm_requests = server.requests if server else 0
+        with tempfile.TemporaryDirectory() as scratch:
+            result = run_level(args, users, base_url, scratch)
+        if result is None:
+            continue
+        if server:
+            result["llm_requests_per_second"] = round((server.requests - llm_requests) / result["wall_seconds"], 2)
+        levels.append(result)
+        print(json.dumps(result), flush=True)
+
+    if levels:
+        # the smallest load that already gets within 5% of the best throughput
+        best = max(level["sessions_per_second"] for level in levels)
+        saturation = min(level["users"] for level in levels if level["sessions_per_second"] >= 0.95 * best)
+        print(json.dumps({"max_sessions_per_second": best, "saturation_users": saturation}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
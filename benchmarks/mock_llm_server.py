@@ -0,0 +1,186 @@
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RESUME_REPLY = {
+    "Full Name": "Jane Doe",
+    "Email Address": "jane.doe@example.com",
+    "Phone Number": "5551234567",
+    "Years of Experience": "2",
+    "Desired Position(s)": "Machine Learning Engineer",
+    "Current Location": "Bengaluru",
+    "Tech Stack": "Python, SQL, PyTorch, Docker, AWS, NLP",
+}
+JD_REPLY = {
+    "Years of Experience": "1",
+    "Desired Position(s)": "Machine Learning Engineer",
+    "Tech Stack": "Python, SQL, TensorFlow, Kubernetes, GCP",
+}
+GRADE_REPLY = {"score": 70, "feedback": "Covers the main idea. Could mention trade-offs and an example."}
+REVIEW_REPLY = "Strengths: solid Python projects.\nWeaknesses: little cloud exposure.\nRecommendations: add deployment work."
+
+
+def rules_reply(prompt):
+    # what the regex and lexicon extractors find in the resume text the prompt carries, so a
+    # prompt that lost part of the resume gets a different answer
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from src.utils.fast_extract import extract_by_rules
+    text = prompt.split("Resume Text:", 1)[-1].rsplit("Answer only the above points", 1)[0]
+    return json.dumps(extract_by_rules(text))
+
+
+def reply_for(prompt, rules=False):
+    if "Resume Parser" in prompt:
+        return rules_reply(prompt) if rules else json.dumps(RESUME_REPLY)
+    if "job description" in prompt and "Tech Stack" in prompt and "review" not in prompt:
+        return json.dumps(JD_REPLY)
+    if "Candidate Answer" in prompt:
+        return json.dumps(GRADE_REPLY)
+    if "interview question" in prompt:
+        return f"What problem does a {random.choice(['hash map', 'index', 'cache', 'queue'])} solve? (#{random.randint(1, 10**6)})"
+    return REVIEW_REPLY
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, request, content):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        chunk_id = f"chatcmpl-{random.getrandbits(48):x}"
+        words = content.split(" ")
+        for i, word in enumerate(words):
+            piece = word if i == len(words) - 1 else word + " "
+            chunk = {
+                "id": chunk_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "mock"),
+                "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.server.options["token_latency"])
+        if (request.get("stream_options") or {}).get("include_usage"):
+            # like the real API: one last chunk with no choices and the whole call's usage
+            prompt_tokens = max(1, len(request["messages"][-1]["content"]) // 4)
+            completion_tokens = max(1, len(content) // 4)
+            chunk = {"id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": request.get("model", "mock"), "choices": [],
+                     "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                               "total_tokens": prompt_tokens + completion_tokens}}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+
+        options = self.server.options
+        self.server.count_request()
+        prompt = request["messages"][-1]["content"]
+        prompt_tokens = max(1, len(prompt) // 4)
+        time.sleep(max(0.0, random.gauss(options["latency"], options["jitter"]))
+                   + options["prompt_latency"] * prompt_tokens / 1000)
+
+        roll = random.random()
+        if roll < options["rate_limit_rate"]:
+            self._send_json(429, {"error": {"message": "rate limited", "type": "rate_limit"}}, {"Retry-After": "0"})
+            return
+        if roll < options["rate_limit_rate"] + options["error_rate"]:
+            self._send_json(500, {"error": {"message": "injected failure", "type": "server_error"}})
+            return
+
+        content = reply_for(prompt, options["rule_replies"])
+        if request.get("stream"):
+            self._send_stream(request, content)
+            return
+        completion_tokens = max(1, len(content) // 4)
+        self._send_json(200, {
+            "id": f"chatcmpl-{random.getrandbits(48):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # many clients connect at once; the default backlog of 5 drops the rest into a 1 s SYN retry
+    request_queue_size = 128
+
+    def __init__(self, address, latency=0.05, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, token_latency=0.0,
+                 prompt_latency=0.0, rule_replies=False):
+        super().__init__(address, MockLLMHandler)
+        self.options = {"latency": latency, "jitter": jitter, "error_rate": error_rate,
+                        "rate_limit_rate": rate_limit_rate, "token_latency": token_latency,
+                        "prompt_latency": prompt_latency, "rule_replies": rule_replies}
+        self.requests = 0
+        self._count_lock = threading.Lock()
+
+    def count_request(self):
+        with self._count_lock:
+            self.requests += 1
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(host="127.0.0.1", port=0, **options):
+    server = MockLLMServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Groq/OpenAI chat-completions endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8008)
+    parser.add_argument("--latency", type=float, default=0.05, help="mean seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="std dev of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="seconds between streamed chunks")
+    parser.add_argument("--prompt-latency", type=float, default=0.0, help="extra seconds per 1000 prompt tokens")
+    parser.add_argument("--rule-replies", action="store_true",
+                        help="answer resume parses with what the rule-based extractors find in the prompt")
+    args = parser.parse_args()
+
+    server = MockLLMServer((args.host, args.port), args.latency, args.jitter, args.error_rate, args.rate_limit_rate,
+                           args.token_latency, args.prompt_latency, args.rule_replies)
+    print(f"mock LLM listening on {server.base_url} (set GROQ_BASE_URL to this)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
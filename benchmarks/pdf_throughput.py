@@ -0,0 +1,80 @@
+import argparse
+import io
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+import PyPDF2
+from fpdf import FPDF
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils import parser as pdf_parser
+
+WORDS = ("developed deployed python sql docker kubernetes pipeline model data team led improved latency "
+         "customers research internship project university education experience dashboard").split()
+
+
+def make_pdf(pages, seed):
+    rng = random.Random(seed)
+    pdf = FPDF()
+    pdf.set_font("Arial", size=10)
+    for _ in range(pages):
+        pdf.add_page()
+        for _ in range(40):
+            line = " ".join(rng.choice(WORDS) for _ in range(12))
+            pdf.multi_cell(0, 6, txt=f"- {line} {rng.randint(1, 99)}%")
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def baseline_extract(data):
+    # extract_text_from_pdf before the engine: sequential, regexes compiled per page, string +=
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    text = ""
+    for page in reader.pages:
+        page_content = page.extract_text() + "\n"
+        clean_text = re.sub(r"^\s*[-*]\s*", "", page_content)
+        clean_text = re.sub(r"[^a-zA-Z0-9\s@,.+]", "", clean_text)
+        text += clean_text
+    return text
+
+
+def run(name, corpus, extract):
+    pdf_parser._text_cache.clear()
+    start = time.perf_counter()
+    for data in corpus:
+        extract(data)
+    seconds = time.perf_counter() - start
+    pages = sum(len(PyPDF2.PdfReader(io.BytesIO(d)).pages) for d in corpus)
+    result = {"variant": name, "pages": pages, "seconds": round(seconds, 3), "pages_per_second": round(pages / seconds, 1)}
+    print(json.dumps(result), flush=True)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF text extraction throughput in pages/second.")
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 40])
+    args = parser.parse_args()
+
+    for pages in args.pages:
+        corpus = [make_pdf(pages, seed) for seed in range(args.docs)]
+        print(f"# {args.docs} documents x {pages} pages", flush=True)
+        run("baseline", corpus, baseline_extract)
+        run("pypdf2", corpus, lambda d: pdf_parser.extract_text_from_pdf(d, backend="pypdf2", parallel=False))
+        run("pypdf2-parallel", corpus, lambda d: pdf_parser.extract_text_from_pdf(d, backend="pypdf2"))
+        if pdf_parser.pypdfium2 is not None:
+            run("pypdfium2", corpus, lambda d: pdf_parser.extract_text_from_pdf(d, backend="pypdfium2", parallel=False))
+            run("pypdfium2-parallel", corpus, lambda d: pdf_parser.extract_text_from_pdf(d, backend="pypdfium2"))
+        for data in corpus:
+            pdf_parser.extract_text_from_pdf(data)
+        start = time.perf_counter()
+        for data in corpus:
+            pdf_parser.extract_text_from_pdf(data)
+        print(json.dumps({"variant": "content-hash cache hit", "seconds": round(time.perf_counter() - start, 4)}))
+
+
+if __name__ == "__main__":
+    main()
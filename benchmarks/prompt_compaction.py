@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+# every call must reach the LLM, or the latency comparison measures the cache
+os.environ["LLM_CACHE"] = "0"
+
+from src.llm import pool
+from src.utils import compaction
+from src.utils.parser import RESUME_PROMPT, extract_candidate_info
+from fast_extract_eval import load_fixtures, _skills, _same
+
+FIELDS = ["Full Name", "Email Address", "Phone Number", "Years of Experience", "Desired Position(s)", "Current Location"]
+FILLER = ("developed deployed maintained python sql docker pipeline dashboards for customers improved latency "
+          "by 30 percent led a team of four engineers on data quality research and reporting").split()
+
+
+def synthetic_resume(pages, seed):
+    # repeated page header and footer, boilerplate, and long sections, like a multi-page PDF
+    rng = random.Random(seed)
+    header = "Jane Doe\njane.doe@example.com 5551234567\nBengaluru"
+    sections = [
+        ("Summary", 3), ("Skills", 2), ("Experience", 25), ("Projects", 20), ("Education", 4),
+        ("Certifications", 4), ("Hobbies", 4), ("References", 1), ("Declaration", 1),
+    ]
+    body = []
+    for name, lines in sections:
+        body.append(name)
+        for _ in range(lines * pages):
+            body.append("- " + " ".join(rng.choice(FILLER) for _ in range(14)))
+        if name == "Skills":
+            body.append("Python, SQL, PyTorch, Docker, AWS, NLP")
+        if name == "Declaration":
+            body.append("I hereby declare that the above information is true to the best of my knowledge.")
+    per_page = -(-len(body) // pages)
+    out = []
+    for page in range(pages):
+        lines = [header] + body[page * per_page:(page + 1) * per_page] + [f"Page {page + 1} of {pages}"]
+        out.append("\n".join(lines))
+    return compaction.PAGE_BREAK.join(out)
+
+
+def extract(text, compact):
+    compaction.PROMPT_COMPACTION = compact
+    start = time.perf_counter()
+    info = extract_candidate_info(text)
+    return info, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt tokens, latency and extracted fields with and without compaction.")
+    parser.add_argument("fixtures", nargs="*", help="PDF or .txt resumes, or directories of them")
+    parser.add_argument("--synthetic", type=int, nargs="*", default=[], help="also generate resumes of these page counts")
+    parser.add_argument("--mock", action="store_true",
+                        help="run against a local stand-in whose answers and latency depend on the prompt")
+    parser.add_argument("--prompt-latency", type=float, default=0.2, help="mock: seconds per 1000 prompt tokens")
+    args = parser.parse_args()
+
+    if args.mock:
+        from mock_llm_server import start_server
+        # a fixed canned answer could never show a field lost to compaction
+        server = start_server(latency=0.05, prompt_latency=args.prompt_latency, rule_replies=True)
+        pool.GROQ_BASE_URL = server.base_url
+        os.environ.setdefault("GROQ_API", "mock")
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else []
+    fixtures += [(f"synthetic-{pages}p", synthetic_resume(pages, pages)) for pages in args.synthetic]
+    if not fixtures:
+        parser.error("give fixtures or --synthetic page counts")
+
+    totals = {"tokens_full": 0, "tokens_compact": 0, "seconds_full": 0.0, "seconds_compact": 0.0}
+    unchanged = {field: 0 for field in FIELDS + ["Tech Stack"]}
+    for name, text in fixtures:
+        compaction.PROMPT_COMPACTION = True
+        tokens_full = compaction.approx_tokens(RESUME_PROMPT.format(text=text))
+        tokens_compact = compaction.approx_tokens(RESUME_PROMPT.format(text=compaction.compact_resume(text)))
+        full, seconds_full = extract(text, False)
+        compact, seconds_compact = extract(text, True)
+        same = {field: _same(field, full.get(field), compact.get(field)) for field in FIELDS}
+        same["Tech Stack"] = _skills(full) == _skills(compact)
+        for field, ok in same.items():
+            unchanged[field] += ok
+        totals["tokens_full"] += tokens_full
+        totals["tokens_compact"] += tokens_compact
+        totals["seconds_full"] += seconds_full
+        totals["seconds_compact"] += seconds_compact
+        print(json.dumps({"fixture": name, "tokens_full": tokens_full, "tokens_compact": tokens_compact,
+                          "seconds_full": round(seconds_full, 3), "seconds_compact": round(seconds_compact, 3),
+                          "changed_fields": [field for field, ok in same.items() if not ok]}), flush=True)
+
+    n = len(fixtures)
+    print(json.dumps({
+        "fixtures": n,
+        "token_reduction": round(1 - totals["tokens_compact"] / totals["tokens_full"], 3),
+        "latency_reduction": round(1 - totals["seconds_compact"] / totals["seconds_full"], 3),
+        "unchanged_fields": {field: round(count / n, 3) for field, count in unchanged.items()},
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+# a throwaway embedding cache, and no batching window adding its wait to every encode
+os.environ["EMBEDDING_CACHE_DIR"] = tempfile.mkdtemp(prefix="scoring-suite-")
+os.environ["ENCODER_BATCHING"] = "0"
+os.environ.setdefault("GROQ_API", "offline")
+
+from src.llm import pool
+from src.utils import ats, resources
+from stand_ins import StubEmbeddingModel, StubLLMClient, ensure_readability
+
+SKILL_SIZES = [5, 20, 50, 100, 200]
+WORD_SIZES = [200, 500, 1000, 2500, 5000]
+ATS_SIZES = [(5, 200), (20, 1000), (50, 2500), (200, 5000)]
+SECTIONS = ["Summary", "Education", "Experience", "Projects", "Skills", "Certifications"]
+FILLER = ("the a of for with on team project data system users customers production pipeline service "
+          "model report weekly across new using three large internal").split()
+EXTRA_SKILLS = ("Kafka Airflow Redis Terraform Ansible Jenkins Grafana Prometheus Elasticsearch Snowflake dbt Looker "
+                "Figma Jira Linux Bash GraphQL gRPC RabbitMQ Celery Hadoop Hive Databricks MLflow OpenCV spaCy").split()
+
+
+def install_stand_ins(model):
+    llm = StubLLMClient()
+    pool._clients["openai"] = pool._clients["groq"] = llm
+    if model == "stub":
+        resources._resources["sbert_model"] = StubEmbeddingModel()
+    return llm, ensure_readability()
+
+
+def skill_stack(n, rng):
+    # known skills under their aliases and odd casing, plus skills the normalizer has never seen
+    normalizer = resources.get_skill_normalizer()
+    known = [rng.choice([canonical] + aliases) for canonical, aliases in normalizer.items()]
+    rng.shuffle(known)
+    stack = [s.upper() if rng.random() < 0.2 else s for s in known[:n // 2]]
+    extras = rng.sample(EXTRA_SKILLS, len(EXTRA_SKILLS))
+    for i in range(n - len(stack)):
+        extra = extras[i % len(extras)]
+        stack.append(extra if i < len(extras) else f"{extra} {i // len(extras) + 1}.x")
+    rng.shuffle(stack)
+    return stack
+
+
+def resume_text(words, rng):
+    verbs = resources.get_verbs()
+    vocabulary = FILLER * 4 + [w for group in verbs.values() for w in group]
+    lines, count = [], 0
+    while count < words:
+        for section in SECTIONS:
+            lines.append(section)
+            for _ in range(3):
+                sentence = [rng.choice(vocabulary) for _ in range(rng.randint(8, 18))]
+                if rng.random() < 0.4:
+                    sentence.append(f"{rng.randint(2, 95)}%")
+                lines.append("- " + " ".join(sentence).capitalize() + ".")
+                count += len(sentence)
+            if count >= words:
+                break
+    return "\n".join(lines)
+
+
+def build_cases(seed):
+    rng = random.Random(seed)
+    cases = []
+    for n in SKILL_SIZES:
+        skills = skill_stack(n, rng)
+        cases.append(("normalize_skills", {"skills": n}, lambda s=skills: ats.normalize_skills(s)))
+    for n in SKILL_SIZES:
+        resume_skills = ats.normalize_skills(skill_stack(n, rng))
+        jd_skills = ats.normalize_skills(skill_stack(max(5, n // 2), rng))
+        cases.append(("semantic_skill_match", {"skills": n},
+                      lambda r=resume_skills, j=jd_skills: ats.semantic_skill_match(r, j)))
+    for words in WORD_SIZES:
+        text = resume_text(words, rng)
+        cases.append(("check_formatting_issues", {"words": words}, lambda t=text: ats.check_formatting_issues(t)))
+        cases.append(("readability_score", {"words": words}, lambda t=text: ats.readability_score(t)))
+        cases.append(("calculate_soft_factors", {"words": words}, lambda t=text: ats.calculate_soft_factors(t)))
+    for n, words in ATS_SIZES:
+        resume = {"Tech Stack": ", ".join(skill_stack(n, rng)), "Years of Experience": "2"}
+        jd = {"Tech Stack": ", ".join(skill_stack(max(5, n // 2), rng)), "Years of Experience": "3"}
+        text = resume_text(words, rng)
+        cases.append(("calculate_ats_score", {"skills": n, "words": words},
+                      lambda r=resume, j=jd, t=text: ats.calculate_ats_score(r, j, t)))
+    return cases
+
+
+def case_key(name, size):
+    return name + "[" + ",".join(f"{k}={v}" for k, v in sorted(size.items())) + "]"
+
+
+def measure(fn, repeat, min_time):
+    # first call fills the embedding cache and lexicons; then enough calls per sample to time reliably
+    fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {"median_ms": round(1000 * statistics.median(samples), 4), "min_ms": round(1000 * min(samples), 4),
+            "calls_per_sample": number, "samples": repeat}
+
+
+def run(args):
+    llm, readability = install_stand_ins(args.model)
+    meta = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "embedding_model": args.model,
+        "readability": readability,
+        "seed": args.seed,
+    }
+    results = []
+    for name, size, fn in build_cases(args.seed):
+        if args.only and name not in args.only:
+            continue
+        result = {"case": case_key(name, size), "function": name, "size": size, **measure(fn, args.repeat, args.min_time)}
+        results.append(result)
+        print(json.dumps(result), flush=True)
+    if llm.calls:
+        print(f"warning: {llm.calls} LLM calls reached the stub client", file=sys.stderr)
+    report = {"meta": meta, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+    return report
+
+
+def compare(base_path, new_path, threshold):
+    with open(base_path, "r") as f:
+        base = json.load(f)
+    with open(new_path, "r") as f:
+        new = json.load(f)
+    for field in ("embedding_model", "readability", "seed"):
+        if base["meta"].get(field) != new["meta"].get(field):
+            print(f"warning: runs differ in {field}: {base['meta'].get(field)} vs {new['meta'].get(field)}", file=sys.stderr)
+
+    before = {result["case"]: result for result in base["results"]}
+    slower = 0
+    for result in new["results"]:
+        old = before.get(result["case"])
+        if old is None:
+            continue
+        ratio = result["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+        status = "slower" if ratio > 1 + threshold else "faster" if ratio < 1 - threshold else "same"
+        slower += status == "slower"
+        print(json.dumps({"case": result["case"], "base_ms": old["median_ms"], "new_ms": result["median_ms"],
+                          "ratio": round(ratio, 3), "status": status}), flush=True)
+    print(json.dumps({"compared": sum(r["case"] in before for r in new["results"]), "slower": slower,
+                      "threshold": threshold}), flush=True)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the scoring functions on synthetic resumes and skill stacks, offline.")
+    parser.add_argument("--output", help="write the full run as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two saved runs instead of timing")
+    parser.add_argument("--threshold", type=float, default=0.15, help="relative median change counted as a slowdown")
+    parser.add_argument("--only", nargs="*", help="time only these functions")
+    parser.add_argument("--model", choices=["stub", "sbert"], default="stub", help="embedding model for skill matching")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per case")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds each sample runs for at least")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.compare:
+        # non-zero exit when anything got slower, so CI can fail the build
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
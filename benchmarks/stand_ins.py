@@ -0,0 +1,68 @@
+import re
+import zlib
+from types import SimpleNamespace
+import numpy as np
+
+# offline stand-ins shared by the benchmarks that must run without the model or the API
+
+
+class StubEmbeddingModel:
+    # character trigrams hashed into a fixed vector: deterministic across runs and machines,
+    # and similar spellings land close together, so matching still does real work
+    def __init__(self, dim=384):
+        self.dim = dim
+
+    def encode(self, texts, convert_to_numpy=True, batch_size=32):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            text = f"  {str(text).lower()} "
+            for i in range(len(text) - 2):
+                vectors[row, zlib.crc32(text[i:i + 3].encode("utf-8")) % self.dim] += 1
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+
+class StubLLMClient:
+    # nothing scored here should reach an LLM; if something does, it gets an empty answer offline
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.calls = 0
+
+    def create(self, **request):
+        self.calls += 1
+        message = SimpleNamespace(content="{}")
+        usage = SimpleNamespace(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def _syllables(word):
+    return max(1, len(re.findall(r"[aeiouy]+", word.lower().rstrip("e"))))
+
+
+def _counts(text):
+    words = re.findall(r"[A-Za-z]+", text)
+    sentences = max(1, len(re.findall(r"[.!?]+", text)))
+    return max(1, len(words)), sentences, sum(_syllables(w) for w in words)
+
+
+def heuristic_textstat():
+    # textstat needs the nltk cmudict corpus; without it the same formulas run on a vowel-group syllable count
+    def ease(text):
+        words, sentences, syllables = _counts(text)
+        return round(206.835 - 1.015 * words / sentences - 84.6 * syllables / words, 2)
+
+    def grade(text):
+        words, sentences, syllables = _counts(text)
+        return round(0.39 * words / sentences + 11.8 * syllables / words - 15.59, 2)
+    return SimpleNamespace(flesch_reading_ease=ease, flesch_kincaid_grade=grade)
+
+
+def ensure_readability():
+    # swaps in the heuristic only when textstat cannot run here; returns which one scoring uses
+    from src.utils import ats
+    try:
+        ats.textstat.flesch_reading_ease("A short sentence to check the syllable data.")
+    except LookupError:
+        ats.textstat = heuristic_textstat()
+        return "heuristic"
+    return "textstat"
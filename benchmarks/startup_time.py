@@ -0,0 +1,56 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# what app.py imports, plus the first resource each view touches
+APP_IMPORTS = """
+import streamlit, streamlit_option_menu
+import src.utils.parser, src.utils.ats, src.utils.assessment
+from src.utils import resources
+"""
+VIEW_WORK = {
+    "home": "",
+    "ats": "resources.get_skill_index(); resources.get_sbert_model()",
+    "technical1": "",
+    "technical2": "",
+}
+CHILD = """
+import time
+start = time.perf_counter()
+{imports}
+if {eager}:
+    resources.warm_up()
+{work}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(view, eager):
+    code = CHILD.format(imports=APP_IMPORTS, eager=eager, work=VIEW_WORK[view])
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+                         env={**os.environ, "PRELOAD_RESOURCES": "0"})
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time per view mode, lazy vs eager resource loading.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    for view in VIEW_WORK:
+        for eager in (False, True):
+            times = [measure(view, eager) for _ in range(args.repeat)]
+            results.append({"view": view, "loading": "eager" if eager else "lazy",
+                            "median_s": round(statistics.median(times), 3), "runs": [round(t, 3) for t in times]})
+            print(json.dumps(results[-1]), flush=True)
+
+
+if __name__ == "__main__":
+    main()
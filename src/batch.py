@@ -0,0 +1,164 @@
+import argparse
+import json
+import multiprocessing
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from src.utils.parser import extract_text_from_pdf, extract_candidate_info
+from src.utils.ats import calculate_ats_score
+from src.utils.jd_store import get_jd_store, jd_id_for
+from src.utils.pipeline import start_jd_profile
+from src.llm.scheduler import llm_priority, BULK
+from src.utils.fast_extract import extract_candidate_info_fast, SCORING_FIELDS
+
+
+def find_resumes(paths):
+    resumes = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            resumes.extend(sorted(path.rglob("*.pdf")))
+        else:
+            resumes.append(path)
+    return resumes
+
+
+def load_completed(out_path):
+    completed = set()
+    if not out_path.exists():
+        return completed
+    with open(out_path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # a line cut short by an interrupted run
+                continue
+            if "error" not in record:
+                completed.add(record["file"])
+    return completed
+
+
+def drop_partial_line(out_path):
+    # an interrupted run can stop half way through a record; the next record must start on its own line
+    if not out_path.exists():
+        return
+    with open(out_path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def _extract_text(path):
+    # already inside a worker process, so no nested page pool
+    with open(path, "rb") as f:
+        return extract_text_from_pdf(f, parallel=False)
+
+
+def _extract_offline(text):
+    return extract_candidate_info_fast(text, SCORING_FIELDS, llm_fallback=False)
+
+
+def _score(resume_info, jd_info, text):
+    return calculate_ats_score(resume_info, jd_info, text)
+
+
+class BatchScorer:
+    def __init__(self, jd_profile, cpu_pool, llm_concurrency, offline=False, jd_id=None):
+        # jd_profile may still be a Future while the JD is parsed and embedded
+        self.jd_profile = jd_profile
+        self.jd_id = jd_id or jd_profile.jd_id
+        self.cpu_pool = cpu_pool
+        self.llm_slots = threading.BoundedSemaphore(llm_concurrency)
+        self.offline = offline
+
+    def score_one(self, path):
+        record = {"file": str(path), "jd_id": self.jd_id}
+        start = time.perf_counter()
+        try:
+            text = self.cpu_pool.submit(_extract_text, str(path)).result()
+            if self.offline:
+                resume_info = self.cpu_pool.submit(_extract_offline, text).result()
+            else:
+                with self.llm_slots, llm_priority(BULK):
+                    resume_info = extract_candidate_info(text)
+            jd_profile = self.jd_profile.result() if isinstance(self.jd_profile, Future) else self.jd_profile
+            ats, info = self.cpu_pool.submit(_score, resume_info, jd_profile, text).result()
+            record.update({"candidate": resume_info, "ats_score": ats, "breakdown": info})
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["seconds"] = round(time.perf_counter() - start, 3)
+        return record
+
+
+def run_batch(jd_profile, resumes, out_path, workers=4, llm_concurrency=4, offline=False, jd_id=None):
+    out_path = Path(out_path)
+    drop_partial_line(out_path)
+    completed = load_completed(out_path)
+    todo = [path for path in resumes if str(path) not in completed]
+    print(f"{len(resumes)} resumes, {len(resumes) - len(todo)} already scored, {len(todo)} to go", file=sys.stderr)
+    if not todo:
+        return
+
+    max_in_flight = 2 * (workers + llm_concurrency)
+    scored = failed = 0
+
+    def write(futures):
+        nonlocal scored, failed
+        for future in futures:
+            record = future.result()
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            if "error" in record:
+                failed += 1
+            else:
+                scored += 1
+
+    with open(out_path, "a") as out, \
+            ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as cpu_pool, \
+            ThreadPoolExecutor(workers + llm_concurrency) as orchestrator:
+        scorer = BatchScorer(jd_profile, cpu_pool, llm_concurrency, offline, jd_id)
+        pending = set()
+        for path in todo:
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write(done)
+            pending.add(orchestrator.submit(scorer.score_one, path))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            write(done)
+
+    print(f"scored {scored}, failed {failed}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a batch of PDF resumes against one job description.")
+    jd = parser.add_mutually_exclusive_group(required=True)
+    jd.add_argument("--jd", help="text file with the job description")
+    jd.add_argument("--jd-id", help="id of a job description registered with python -m src.utils.jd_store")
+    parser.add_argument("--out", required=True, help="JSONL output, appended to and used to resume interrupted runs")
+    parser.add_argument("--workers", type=int, default=4, help="processes for PDF extraction and scoring")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="resume parses in flight at once")
+    parser.add_argument("--offline", action="store_true",
+                        help="extract Tech Stack and Years of Experience with rules only, without calling the LLM")
+    parser.add_argument("resumes", nargs="+", help="PDF files or directories of PDFs")
+    args = parser.parse_args(argv)
+
+    store = get_jd_store()
+    if args.jd:
+        with open(args.jd, "r") as f:
+            jd_text = f.read()
+        jd_id = jd_id_for(jd_text)
+        # a new JD is parsed while the first resumes are extracted and parsed
+        jd_profile = store.get(jd_id) or start_jd_profile(jd_text, store)
+    else:
+        jd_id = args.jd_id
+        jd_profile = store.get(jd_id)
+        if jd_profile is None:
+            parser.error(f"unknown job description id {jd_id}")
+    run_batch(jd_profile, find_resumes(args.resumes), args.out, args.workers, args.llm_concurrency, args.offline, jd_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-import json
 from fpdf import FPDF
 
 
@@ -11,9 +10,8 @@ def generate_pdf_report(questions, answers, grades):
     pdf.ln(10)
 
     for i, (ques, ans, grade) in enumerate(zip(questions, answers, grades), 1):
-        data = json.loads(grade)
-        score = data["score"]
-        feedback = data["feedback"]
+        score = grade["score"]
+        feedback = grade["feedback"]
 
         pdf.set_font("Arial", 'B', 11)
         pdf.multi_cell(0, 10, txt=f"Question {i}:")
@@ -0,0 +1,267 @@
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TRACE_FILE = os.environ.get("TRACE_FILE")
+TRACE_BUFFER = 2048
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_enabled = os.environ.get("TRACING", "0") == "1" or bool(TRACE_FILE)
+_current = contextvars.ContextVar("current_span", default=None)
+_ids = itertools.count(1)
+_spans = deque(maxlen=TRACE_BUFFER)
+_stages = {}
+_tokens = {}
+_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ("name", "attrs", "span_id", "parent_id", "start", "seconds", "_token")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.span_id = next(_ids)
+        self.parent_id = None
+        self.seconds = None
+        self._token = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        parent = _current.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        if self._token is not None:
+            _current.reset(self._token)
+        _finish(self)
+        return False
+
+
+class _DetachedSpan(Span):
+    # Timed and recorded like any span, but never made the current one: the caller's code runs
+    # between a generator's yields, and an abandoned generator is closed in some other context.
+    __slots__ = ()
+
+    def __enter__(self):
+        parent = _current.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = time.perf_counter()
+        return self
+
+
+class _NoopSpan:
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def enabled():
+    return _enabled
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = flag
+
+
+def span(name, **attrs):
+    if not _enabled:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def generator_span(name, **attrs):
+    if not _enabled:
+        return _NOOP
+    return _DetachedSpan(name, attrs)
+
+
+def traced(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span():
+    current = _current.get() if _enabled else None
+    return current if current is not None else _NOOP
+
+
+def record_usage(response, model):
+    # token counts from an OpenAI-compatible response, attached to the innermost open span
+    usage = getattr(response, "usage", None)
+    if not _enabled or usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+    completion_tokens = getattr(usage, "completion_tokens", None) or 0
+    current = _current.get()
+    if current is not None:
+        current.set(model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    with _lock:
+        for kind, count in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+            _tokens[(model, kind)] = _tokens.get((model, kind), 0) + count
+
+
+def _finish(finished):
+    record = {
+        "name": finished.name,
+        "span_id": finished.span_id,
+        "parent_id": finished.parent_id,
+        "start": time.time() - finished.seconds,
+        "seconds": round(finished.seconds, 6),
+        **finished.attrs,
+    }
+    with _lock:
+        _spans.append(record)
+        stage = _stages.get(finished.name)
+        if stage is None:
+            stage = _stages[finished.name] = {"count": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS)}
+        stage["count"] += 1
+        stage["sum"] += finished.seconds
+        for i, bound in enumerate(BUCKETS):
+            if finished.seconds <= bound:
+                stage["buckets"][i] += 1
+        if TRACE_FILE:
+            with open(TRACE_FILE, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+
+def recent_spans(limit=None):
+    with _lock:
+        spans = list(_spans)
+    return spans[-limit:] if limit else spans
+
+
+def stage_summary():
+    with _lock:
+        durations = {}
+        for record in _spans:
+            durations.setdefault(record["name"], []).append(record["seconds"])
+        totals = {name: (stage["count"], stage["sum"]) for name, stage in _stages.items()}
+    result = []
+    for name, (count, total) in sorted(totals.items()):
+        recent = sorted(durations.get(name, [0.0]))
+        result.append({
+            "stage": name,
+            "count": count,
+            "mean_seconds": total / count,
+            "p50_seconds": recent[len(recent) // 2],
+            "p95_seconds": recent[min(len(recent) - 1, int(0.95 * len(recent)))],
+        })
+    return result
+
+
+def render_prometheus():
+    from src.llm import metrics
+    from src.llm.scheduler import get_scheduler
+
+    lines = ["# TYPE stage_duration_seconds histogram"]
+    with _lock:
+        stages = {name: (stage["count"], stage["sum"], list(stage["buckets"])) for name, stage in _stages.items()}
+        tokens = dict(_tokens)
+    for name, (count, total, buckets) in sorted(stages.items()):
+        for bound, bucket_count in zip(BUCKETS, buckets):
+            lines.append(f'stage_duration_seconds_bucket{{stage="{name}",le="{bound}"}} {bucket_count}')
+        lines.append(f'stage_duration_seconds_bucket{{stage="{name}",le="+Inf"}} {count}')
+        lines.append(f'stage_duration_seconds_sum{{stage="{name}"}} {total}')
+        lines.append(f'stage_duration_seconds_count{{stage="{name}"}} {count}')
+
+    lines.append("# TYPE llm_tokens_total counter")
+    for (model, kind), count in sorted(tokens.items()):
+        lines.append(f'llm_tokens_total{{model="{model}",kind="{kind}"}} {count}')
+
+    scheduler = get_scheduler().stats()
+    lines.append("# TYPE llm_queue_depth gauge")
+    for model, stats in sorted(scheduler["models"].items()):
+        lines.append(f'llm_queue_depth{{model="{model}"}} {stats["queue_depth"]}')
+    lines.append("# TYPE llm_throttled_total counter")
+    for model, stats in sorted(scheduler["models"].items()):
+        lines.append(f'llm_throttled_total{{model="{model}"}} {stats["throttled"]}')
+    lines.append("# TYPE llm_coalesced_total counter")
+    lines.append(f'llm_coalesced_total {scheduler["coalesced"]}')
+
+    grouped = {}
+    for name, labels, value in metrics.counters():
+        grouped.setdefault(name, []).append((labels, value))
+    for name, values in sorted(grouped.items()):
+        lines.append(f"# TYPE {name} counter")
+        for labels, value in values:
+            label_text = ",".join(f'{key}="{label}"' for key, label in sorted(labels.items()))
+            lines.append(f"{name}{{{label_text}}} {value}")
+
+    for series in metrics.summary():
+        labels = [f'{key}="{value}"' for key, value in sorted(series["labels"].items())]
+        for quantile, field in (("0.5", "p50"), ("0.95", "p95")):
+            quantile_labels = ",".join(['quantile="' + quantile + '"'] + labels)
+            lines.append(f'{series["name"]}{{{quantile_labels}}} {series[field]}')
+        lines.append(f'{series["name"]}_count{{{",".join(labels)}}} {series["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _stages.clear()
+        _tokens.clear()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = render_prometheus(), "text/plain; version=0.0.4"
+        elif self.path == "/spans":
+            body, content_type = "".join(json.dumps(record, default=str) + "\n" for record in recent_spans()), "application/x-ndjson"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+_server = None
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    # Streamlit cannot serve extra routes, so /metrics and /spans get their own small listener
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
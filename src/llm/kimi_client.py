@@ -1,15 +1,31 @@
-from groq import Groq
-from dotenv import load_dotenv
-import os
+from src.llm.pool import get_groq_client, get_async_groq_client
+from src.llm.scheduler import get_scheduler
+from src.helpers import tracing
 
-load_dotenv()   
+KIMI_MODEL = "moonshotai/kimi-k2-instruct-0905"
+KIMI_TEMPERATURE = 0.4
+
+
+def _kimi_request(prompt):
+    return {
+        "model": KIMI_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": KIMI_TEMPERATURE,
+    }
 
 
 def call_kimi(prompt):
-    client = Groq(api_key=os.environ["GROQ_API"])
-    response = client.chat.completions.create(
-        model="moonshotai/kimi-k2-instruct-0905",
-        messages=[{"role": "user","content": prompt}],
-        temperature=0.4,
-        )
-    return response.choices[0].message.content
\ No newline at end of file
+    with tracing.span("llm_call", model=KIMI_MODEL):
+        request = _kimi_request(prompt)
+        response = get_scheduler().call(KIMI_MODEL, request, lambda: get_groq_client().chat.completions.create(**request))
+        tracing.record_usage(response, KIMI_MODEL)
+    return response.choices[0].message.content
+
+
+async def acall_kimi(prompt):
+    with tracing.span("llm_call", model=KIMI_MODEL):
+        request = _kimi_request(prompt)
+        response = await get_scheduler().acall(KIMI_MODEL, request,
+                                               lambda: get_async_groq_client().chat.completions.create(**request))
+        tracing.record_usage(response, KIMI_MODEL)
+    return response.choices[0].message.content
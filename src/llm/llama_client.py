@@ -1,17 +1,68 @@
-from openai import OpenAI
-from dotenv import load_dotenv
-import os
-
-load_dotenv()   
-
-def call_llama(prompt):
-    client = OpenAI(
-        base_url="https://api.groq.com/openai/v1",
-        api_key=os.environ["GROQ_API"],
-        )
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user","content": prompt}],
-        max_tokens=512,
-        )
-    return response.choices[0].message.content
\ No newline at end of file
+from src.llm.pool import get_openai_client, get_async_openai_client
+from src.llm import metrics
+from src.llm.scheduler import LLM_COALESCE, get_scheduler, estimate_tokens
+from src.helpers import tracing
+import time
+
+LLAMA_MODEL = "llama-3.1-8b-instant"
+LLAMA_MAX_TOKENS = 512
+
+
+def _llama_request(prompt):
+    return {
+        "model": LLAMA_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": LLAMA_MAX_TOKENS,
+    }
+
+
+def call_llama(prompt, coalesce=LLM_COALESCE):
+    with tracing.span("llm_call", model=LLAMA_MODEL):
+        request = _llama_request(prompt)
+        response = get_scheduler().call(LLAMA_MODEL, request, lambda: get_openai_client().chat.completions.create(**request),
+                                        coalesce=coalesce)
+        tracing.record_usage(response, LLAMA_MODEL)
+    return response.choices[0].message.content
+
+
+async def acall_llama(prompt, coalesce=LLM_COALESCE):
+    with tracing.span("llm_call", model=LLAMA_MODEL):
+        request = _llama_request(prompt)
+        response = await get_scheduler().acall(LLAMA_MODEL, request,
+                                               lambda: get_async_openai_client().chat.completions.create(**request),
+                                               coalesce=coalesce)
+        tracing.record_usage(response, LLAMA_MODEL)
+    return response.choices[0].message.content
+
+
+def stream_llama(prompt, priority=None):
+    request = _llama_request(prompt)
+    estimated = estimate_tokens(request)
+    scheduler = get_scheduler()
+    scheduler.acquire(LLAMA_MODEL, estimated, priority)
+    start = time.perf_counter()
+    first_token = None
+    used = None
+    received = 0
+    try:
+        stream = get_openai_client().chat.completions.create(stream=True, stream_options={"include_usage": True},
+                                                             **request)
+        for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                used = chunk.usage.total_tokens
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - start
+                metrics.observe("llm_time_to_first_token_seconds", first_token, model=LLAMA_MODEL)
+            received += len(delta)
+            yield delta
+        metrics.observe("llm_stream_total_seconds", time.perf_counter() - start, model=LLAMA_MODEL)
+    finally:
+        # the last chunk carries the usage; a stream cut short is charged for the text it received
+        if used is None:
+            used = len(prompt) // 4 + received // 4
+        scheduler.charge(LLAMA_MODEL, estimated, used)
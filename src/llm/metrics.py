@@ -0,0 +1,60 @@
+import threading
+from collections import deque
+
+WINDOW = 1024
+
+_series = {}
+_counts = {}
+_collectors = []
+_lock = threading.Lock()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def observe(name, value, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _series.setdefault(key, deque(maxlen=WINDOW)).append(value)
+        _counts[key] = _counts.get(key, 0) + 1
+
+
+def register_collector(collect):
+    # collect() returns (name, labels, value) counters, read when the metrics are rendered
+    with _lock:
+        _collectors.append(collect)
+
+
+def counters():
+    with _lock:
+        collectors = list(_collectors)
+    return [counter for collect in collectors for counter in collect()]
+
+
+def _percentile(values, q):
+    index = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[index]
+
+
+def summary():
+    with _lock:
+        items = [(key, sorted(values), _counts[key]) for key, values in _series.items()]
+    result = []
+    for (name, labels), values, count in items:
+        result.append({
+            "name": name,
+            "labels": dict(labels),
+            "count": count,
+            "mean": sum(values) / len(values),
+            "p50": _percentile(values, 0.5),
+            "p95": _percentile(values, 0.95),
+            "max": values[-1],
+        })
+    return result
+
+
+def reset():
+    with _lock:
+        _series.clear()
+        _counts.clear()
@@ -0,0 +1,67 @@
+from groq import Groq, AsyncGroq
+from openai import OpenAI, AsyncOpenAI
+from dotenv import load_dotenv
+import asyncio
+import os
+import threading
+import weakref
+
+load_dotenv()
+
+GROQ_BASE_URL = os.environ.get("GROQ_BASE_URL", "https://api.groq.com").rstrip("/")
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "3"))
+
+_clients = {}
+_async_clients = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _client_options():
+    # the SDKs retry 429/5xx and connection errors with exponential backoff, honouring Retry-After
+    return {"api_key": os.environ["GROQ_API"], "timeout": LLM_TIMEOUT, "max_retries": LLM_MAX_RETRIES}
+
+
+def _factories():
+    return {
+        "groq": lambda: Groq(base_url=GROQ_BASE_URL, **_client_options()),
+        "openai": lambda: OpenAI(base_url=f"{GROQ_BASE_URL}/openai/v1", **_client_options()),
+        "async_groq": lambda: AsyncGroq(base_url=GROQ_BASE_URL, **_client_options()),
+        "async_openai": lambda: AsyncOpenAI(base_url=f"{GROQ_BASE_URL}/openai/v1", **_client_options()),
+    }
+
+
+def _get_client(name):
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = _factories()[name]()
+    return client
+
+
+def _get_async_client(name):
+    # async connection pools are bound to the event loop that opened them
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        if name not in clients:
+            clients[name] = _factories()[name]()
+        return clients[name]
+
+
+def get_groq_client():
+    return _get_client("groq")
+
+
+def get_openai_client():
+    return _get_client("openai")
+
+
+def get_async_groq_client():
+    return _get_async_client("async_groq")
+
+
+def get_async_openai_client():
+    return _get_async_client("async_openai")
@@ -0,0 +1,255 @@
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from src.llm import metrics
+
+# lower runs first
+INTERACTIVE = 0
+DEFAULT = 1
+BULK = 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", DEFAULT: "default", BULK: "bulk"}
+
+LLM_RPM = float(os.environ.get("LLM_RPM", 0))
+LLM_TPM = float(os.environ.get("LLM_TPM", 0))
+# per-model overrides, e.g. {"llama-3.1-8b-instant": [30, 6000]}; 0 means unlimited
+LLM_LIMITS = json.loads(os.environ.get("LLM_LIMITS", "{}"))
+LLM_COALESCE = os.environ.get("LLM_COALESCE", "1") == "1"
+# how often a coroutine waiting behind other callers checks whether it is at the head of the queue
+ASYNC_POLL = 0.01
+
+_priority = contextvars.ContextVar("llm_priority", default=DEFAULT)
+
+
+@contextlib.contextmanager
+def llm_priority(priority):
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_tokens(request):
+    # about four characters per token, plus the completion the request allows for
+    prompt = "".join(str(message.get("content", "")) for message in request.get("messages", []))
+    return len(prompt) // 4 + request.get("max_tokens", 256)
+
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        if not self.rate:
+            return 0
+        # a request larger than the whole bucket waits for a full bucket rather than forever
+        amount = min(amount, self.capacity)
+        return 0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount):
+        if self.rate:
+            self.level = min(self.capacity, self.level - amount)
+
+
+class ModelQueue:
+    def __init__(self, model):
+        rpm, tpm = LLM_LIMITS.get(model, (LLM_RPM, LLM_TPM))
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.waiting = []
+        self.throttled = 0
+        self.dispatched = 0
+
+
+class LLMScheduler:
+    # Callers wait in a per-model priority queue; the head of the queue is released as soon
+    # as both the request bucket and the token bucket can cover it.
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.models = {}
+        self.sequence = itertools.count()
+        self.in_flight = {}
+        self.coalesced = 0
+
+    def _queue(self, model):
+        if model not in self.models:
+            self.models[model] = ModelQueue(model)
+        return self.models[model]
+
+    def _enqueue(self, model, priority):
+        queue = self._queue(model)
+        ticket = (priority, next(self.sequence))
+        heapq.heappush(queue.waiting, ticket)
+        return queue, ticket
+
+    def _try_dispatch(self, queue, ticket, tokens):
+        # None once the ticket is released, otherwise the seconds until the buckets can cover it
+        now = time.monotonic()
+        queue.requests.refill(now)
+        queue.tokens.refill(now)
+        delay = max(queue.requests.wait_time(1), queue.tokens.wait_time(tokens))
+        if queue.waiting[0] == ticket and delay == 0:
+            heapq.heappop(queue.waiting)
+            queue.requests.take(1)
+            queue.tokens.take(tokens)
+            queue.dispatched += 1
+            self.condition.notify_all()
+            return None
+        return delay
+
+    def _observe_wait(self, model, priority, start, throttled):
+        waited = time.monotonic() - start
+        metrics.observe("llm_queue_wait_seconds", waited, model=model, priority=PRIORITY_NAMES.get(priority, priority))
+        if throttled:
+            metrics.observe("llm_throttled_wait_seconds", waited, model=model)
+
+    def acquire(self, model, tokens, priority=None):
+        priority = _priority.get() if priority is None else priority
+        start = time.monotonic()
+        throttled = False
+        with self.condition:
+            queue, ticket = self._enqueue(model, priority)
+            while True:
+                delay = self._try_dispatch(queue, ticket, tokens)
+                if delay is None:
+                    break
+                if delay and not throttled:
+                    throttled = True
+                    queue.throttled += 1
+                self.condition.wait(timeout=delay or None)
+        self._observe_wait(model, priority, start, throttled)
+
+    async def aacquire(self, model, tokens, priority=None):
+        # the same queue as acquire, waited on with asyncio.sleep instead of a blocked thread;
+        # the condition cannot wake a coroutine, so behind other callers it checks back every ASYNC_POLL
+        priority = _priority.get() if priority is None else priority
+        start = time.monotonic()
+        throttled = False
+        with self.condition:
+            queue, ticket = self._enqueue(model, priority)
+        try:
+            while True:
+                with self.condition:
+                    delay = self._try_dispatch(queue, ticket, tokens)
+                    if delay is None:
+                        break
+                    if delay and not throttled:
+                        throttled = True
+                        queue.throttled += 1
+                await asyncio.sleep(min(delay, ASYNC_POLL) if delay else ASYNC_POLL)
+        except BaseException:
+            # a cancelled caller must not stay at the head of the queue
+            with self.condition:
+                if ticket in queue.waiting:
+                    queue.waiting.remove(ticket)
+                    heapq.heapify(queue.waiting)
+                    self.condition.notify_all()
+            raise
+        self._observe_wait(model, priority, start, throttled)
+
+    def settle(self, model, estimated, response):
+        # charge the bucket for what the call really used instead of the estimate
+        usage = getattr(response, "usage", None)
+        used = getattr(usage, "total_tokens", None) if usage is not None else None
+        if used is not None:
+            self.charge(model, estimated, used)
+
+    def charge(self, model, estimated, used):
+        with self.condition:
+            self._queue(model).tokens.take(used - estimated)
+
+    def _join(self, model, request):
+        # the caller that finds no identical request in flight leads it; the others share its future
+        key = (model, hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest())
+        with self.condition:
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        return key, future, leader
+
+    def _leave(self, key):
+        with self.condition:
+            self.in_flight.pop(key, None)
+
+    def call(self, model, request, send, coalesce=LLM_COALESCE):
+        if not coalesce:
+            return self._send(model, request, send)
+        key, future, leader = self._join(model, request)
+        if not leader:
+            # an identical prompt is already on its way; share its answer
+            return future.result()
+        try:
+            response = self._send(model, request, send)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._leave(key)
+
+    def _send(self, model, request, send):
+        estimated = estimate_tokens(request)
+        self.acquire(model, estimated)
+        response = send()
+        self.settle(model, estimated, response)
+        return response
+
+    async def acall(self, model, request, send, coalesce=LLM_COALESCE):
+        # shares in-flight requests with call(), so a sync and an async caller can coalesce too
+        if not coalesce:
+            return await self._asend(model, request, send)
+        key, future, leader = self._join(model, request)
+        if not leader:
+            # shielded: a follower giving up must not cancel the leader's future
+            return await asyncio.shield(asyncio.wrap_future(future))
+        try:
+            response = await self._asend(model, request, send)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._leave(key)
+
+    async def _asend(self, model, request, send):
+        estimated = estimate_tokens(request)
+        await self.aacquire(model, estimated)
+        response = await send()
+        self.settle(model, estimated, response)
+        return response
+
+    def stats(self):
+        with self.condition:
+            return {
+                "coalesced": self.coalesced,
+                "in_flight": len(self.in_flight),
+                "models": {model: {"queue_depth": len(queue.waiting), "throttled": queue.throttled,
+                                   "dispatched": queue.dispatched} for model, queue in self.models.items()},
+            }
+
+
+_scheduler = LLMScheduler()
+
+
+def get_scheduler():
+    return _scheduler
@@ -0,0 +1,266 @@
+import argparse
+import base64
+import binascii
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.utils.parser import PDF_ERRORS, extract_text_from_pdf, extract_candidate_info, extract_jd_skills
+from src.utils.ats import calculate_ats_score
+from src.utils.jd_store import get_jd_store
+from src.helpers import tracing
+
+SERVICE_WORKERS = int(os.environ.get("SERVICE_WORKERS", 8))
+SERVICE_MAX_PENDING = int(os.environ.get("SERVICE_MAX_PENDING", 32))
+SERVICE_TIMEOUT = float(os.environ.get("SERVICE_TIMEOUT", 120))
+SERVICE_MAX_BATCH = int(os.environ.get("SERVICE_MAX_BATCH", 100))
+SERVICE_MAX_BODY = int(os.environ.get("SERVICE_MAX_BODY", 20 * 1024 * 1024))
+
+
+class RequestError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _resume_text(payload):
+    if payload.get("resume_pdf_base64"):
+        try:
+            data = base64.b64decode(payload["resume_pdf_base64"], validate=True)
+        except (binascii.Error, TypeError, ValueError):
+            raise RequestError(400, "resume_pdf_base64 is not valid base64")
+        try:
+            return extract_text_from_pdf(data)
+        except PDF_ERRORS as e:
+            raise RequestError(400, f"resume_pdf_base64 is not a readable PDF: {e}")
+    if payload.get("resume_text"):
+        return payload["resume_text"]
+    raise RequestError(400, "resume_text or resume_pdf_base64 is required")
+
+
+def _jd(payload):
+    # a JD id or JD text goes through the profile store, so its skills are embedded once
+    store = get_jd_store()
+    if payload.get("jd_id"):
+        profile = store.get(payload["jd_id"])
+        if profile is None:
+            raise RequestError(404, f"unknown job description id {payload['jd_id']}")
+        return profile
+    if payload.get("jd_info"):
+        return payload["jd_info"]
+    if payload.get("jd_text"):
+        return store.get(store.register(payload["jd_text"]))
+    raise RequestError(400, "jd_id, jd_info or jd_text is required")
+
+
+def parse(payload):
+    result = {}
+    if payload.get("resume_text") or payload.get("resume_pdf_base64"):
+        result["resume"] = extract_candidate_info(_resume_text(payload))
+    if payload.get("jd_text"):
+        result["jd"] = extract_jd_skills(payload["jd_text"])
+    if not result:
+        raise RequestError(400, "nothing to parse: send resume_text, resume_pdf_base64 or jd_text")
+    return result
+
+
+def score(payload, jd=None):
+    jd = jd if jd is not None else _jd(payload)
+    text = _resume_text(payload)
+    resume_info = payload.get("resume_info") or extract_candidate_info(text)
+    ats, info = calculate_ats_score(resume_info, jd, text)
+    return {"candidate": resume_info, "ats_score": ats, "breakdown": info}
+
+
+class ScoringService:
+    # Work runs on a fixed pool; at most max_pending jobs may be queued or running, and
+    # anything beyond that is refused straight away with 503 instead of piling up.
+    def __init__(self, workers=SERVICE_WORKERS, max_pending=SERVICE_MAX_PENDING, timeout=SERVICE_TIMEOUT):
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="service")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.lock = threading.Lock()
+
+    def _admit(self, jobs):
+        with self.lock:
+            if self.pending + jobs > self.max_pending:
+                self.rejected += 1
+                raise RequestError(503, "server busy, retry later", {"Retry-After": "1"})
+            self.pending += jobs
+
+    def _release(self, future):
+        with self.lock:
+            self.pending -= 1
+
+    def submit(self, func, *args):
+        self._admit(1)
+        future = self.pool.submit(func, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def submit_many(self, func, items, *args):
+        # A batch takes the slots that are free (no more than there are workers) and feeds
+        # its items through them one after another, so it is only refused when none are free.
+        with self.lock:
+            slots = min(len(items), self.workers, self.max_pending - self.pending)
+            if slots <= 0:
+                self.rejected += 1
+                raise RequestError(503, "server busy, retry later", {"Retry-After": "1"})
+            self.pending += slots
+        futures = [Future() for _ in items]
+        remaining = iter(range(len(items)))
+        remaining_lock = threading.Lock()
+
+        def start_next(_=None):
+            with remaining_lock:
+                # items whose caller already gave up (504) are skipped
+                i = next((i for i in remaining if not futures[i].cancelled()), None)
+            if i is None:
+                self._release(None)
+                return
+            job = self.pool.submit(func, items[i], *args)
+            job.add_done_callback(lambda job, i=i: (_copy(job, futures[i]), start_next()))
+
+        for _ in range(slots):
+            start_next()
+        return futures
+
+    def wait(self, future, deadline):
+        try:
+            return future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeout:
+            # the job keeps its slot until it really finishes
+            future.cancel()
+            with self.lock:
+                self.timed_out += 1
+            raise RequestError(504, f"request did not finish within {self.timeout:g} seconds")
+
+    def handle(self, path, payload):
+        deadline = time.monotonic() + self.timeout
+        if path == "/parse":
+            return self.wait(self.submit(parse, payload), deadline)
+        if path == "/score":
+            return self.wait(self.submit(score, payload), deadline)
+        if path == "/batch-score":
+            resumes = payload.get("resumes")
+            if not isinstance(resumes, list) or not resumes:
+                raise RequestError(400, "resumes must be a non-empty list")
+            if len(resumes) > SERVICE_MAX_BATCH:
+                raise RequestError(413, f"at most {SERVICE_MAX_BATCH} resumes per batch")
+            jd = self.wait(self.submit(_jd, payload), deadline)
+            futures = self.submit_many(_score_item, resumes, jd)
+            return {"results": [self._batch_result(resume, future, deadline) for resume, future in zip(resumes, futures)]}
+        raise RequestError(404, f"no such endpoint {path}")
+
+    def _batch_result(self, resume, future, deadline):
+        # one bad resume does not fail the whole batch
+        try:
+            return {"id": resume.get("id"), **self.wait(future, deadline)}
+        except RequestError as e:
+            return {"id": resume.get("id"), "error": str(e), "status": e.status}
+        except Exception as e:
+            return {"id": resume.get("id"), "error": f"{type(e).__name__}: {e}", "status": 500}
+
+    def metrics(self):
+        with self.lock:
+            lines = [
+                "# TYPE service_pending_jobs gauge", f"service_pending_jobs {self.pending}",
+                "# TYPE service_rejected_total counter", f"service_rejected_total {self.rejected}",
+                "# TYPE service_timeouts_total counter", f"service_timeouts_total {self.timed_out}",
+            ]
+        return "\n".join(lines) + "\n" + tracing.render_prometheus()
+
+
+def _copy(job, future):
+    try:
+        if job.exception() is None:
+            future.set_result(job.result())
+        else:
+            future.set_exception(job.exception())
+    except InvalidStateError:
+        # cancelled by a caller that timed out
+        pass
+
+
+def _score_item(resume, jd):
+    return score({"resume_text": resume.get("text"), "resume_pdf_base64": resume.get("pdf_base64"),
+                  "resume_info": resume.get("info")}, jd)
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send(200, self.service.metrics(), "text/plain; version=0.0.4")
+        else:
+            self._send(404, {"error": f"no such endpoint {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length > SERVICE_MAX_BODY:
+                self.close_connection = True
+                raise RequestError(413, "request body too large")
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                raise RequestError(400, f"invalid JSON: {e}")
+            if not isinstance(payload, dict):
+                raise RequestError(400, "request body must be a JSON object")
+            self._send(200, self.service.handle(self.path, payload))
+        except RequestError as e:
+            self._send(e.status, {"error": str(e)}, headers=e.headers)
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+
+def make_server(host="127.0.0.1", port=8080, service=None):
+    handler = type("Handler", (ServiceHandler,), {"service": service or ScoringService()})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume parsing and ATS scoring over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="jobs run at once")
+    parser.add_argument("--max-pending", type=int, default=SERVICE_MAX_PENDING,
+                        help="jobs queued or running before new requests get 503")
+    parser.add_argument("--timeout", type=float, default=SERVICE_TIMEOUT, help="seconds before a request gets 504")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, ScoringService(args.workers, args.max_pending, args.timeout))
+    print(f"scoring service listening on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,90 @@
 import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 import streamlit as st
+from rapidfuzz import fuzz
 from src.llm.llama_client import call_llama
+from src.llm.scheduler import llm_priority, INTERACTIVE
 from src.helpers.pdf_report import generate_pdf_report
+from src.helpers import tracing
+from src.utils.question_bank import get_question_bank
 
+TOTAL_QUESTIONS = 5
+DUPLICATE_THRESHOLD = 85
 
-def generate_technical_questions(tech_stack, q_number):
+# shared by all sessions; LLM calls are I/O bound
+_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("ASSESSMENT_WORKERS", 16)), thread_name_prefix="assessment")
+
+
+@tracing.traced("generate_technical_questions")
+def generate_technical_questions(tech_stack, q_number, focus=None, avoid=None, priority=INTERACTIVE):
     prompt = f"""
     You are an expert technical interviewer. This is question number {q_number}.
     Ask one technical short answer interview question about the given tech stack: {tech_stack} to test understanding.
     Wait for the answer before moving to the next question. Do not ask coding questions.
     Output only the question without any additional text.
     """
-    return call_llama(prompt)
-
-
+    if focus:
+        prompt += f"Focus this question on {focus}.\n"
+    if avoid:
+        prompt += "Do not repeat or rephrase any of these questions:\n" + "\n".join(f"- {q}" for q in avoid) + "\n"
+    # usually a candidate is waiting on this; sampled, so two sessions asking the same prompt
+    # each get their own question
+    with llm_priority(priority):
+        return call_llama(prompt, coalesce=False)
+
+
+def is_duplicate_question(question, previous):
+    return any(fuzz.token_set_ratio(question.lower(), p.lower()) >= DUPLICATE_THRESHOLD for p in previous)
+
+
+def _ready(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class QuestionPrefetcher:
+    def __init__(self, tech_stack, total=TOTAL_QUESTIONS):
+        from src.utils.ats import normalize_skills
+        self.tech_stack = tech_stack
+        skills = [s.strip() for s in str(tech_stack).split(",") if s.strip()]
+        canonical = normalize_skills(skills) if skills else []
+
+        # banked questions for the canonical skills are ready at once; only uncovered skills wait on the LLM
+        bank = get_question_bank()
+        banked = []
+        self.futures = []
+        self.focus = []
+        for i in range(total):
+            skill = canonical[i % len(canonical)] if canonical else None
+            # spread the concurrent requests over different skills so they do not collide; the LLM
+            # is asked about the same skill the bank was, so an alias does not shift the slots
+            self.focus.append(skill if len(canonical) > 1 else None)
+            question = bank.sample(skill, banked) if skill else None
+            if question:
+                banked.append(question)
+                self.futures.append(_ready(question))
+            else:
+                self.futures.append(_executor.submit(generate_technical_questions, tech_stack, i + 1, self.focus[i]))
+            if skill:
+                bank.request_refill(skill)
+        self.questions = []
+
+    def get(self, q_number):
+        while len(self.questions) < q_number:
+            i = len(self.questions)
+            try:
+                question = self.futures[i].result()
+            except Exception:
+                question = None
+            if not question or is_duplicate_question(question, self.questions):
+                question = generate_technical_questions(self.tech_stack, i + 1, self.focus[i], avoid=self.questions)
+            self.questions.append(question)
+        return self.questions[q_number - 1]
+
+
+@tracing.traced("grade_open_answer")
 def grade_open_answer(question, answer):
     prompt = f"""You are an expert technical interviewer.
     Question: {question}
@@ -31,7 +102,33 @@ def grade_open_answer(question, answer):
       "feedback": "..."
     }}
     """
-    return call_llama(prompt)
+    with llm_priority(INTERACTIVE):
+        return call_llama(prompt)
+
+
+def parse_grade(raw_output):
+    try:
+        data = json.loads(raw_output)
+    except json.JSONDecodeError:
+        cleaned = raw_output.strip("` \n").replace("json\n", "")
+        data = json.loads(cleaned)
+    if not isinstance(data, dict) or "score" not in data or "feedback" not in data:
+        raise ValueError("grade is missing score or feedback")
+    score = data["score"]
+    if not isinstance(score, (int, float)):
+        score = float(score)
+    return {"score": score, "feedback": str(data["feedback"])}
+
+
+def submit_grade(question, answer):
+    return _executor.submit(grade_open_answer, question, answer)
+
+
+def resolve_grade(job):
+    try:
+        return parse_grade(job.result()), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
 
 
 def run_assessment(mode, tech_stack, prefix="answer"):
@@ -42,15 +139,17 @@ def run_assessment(mode, tech_stack, prefix="answer"):
         st.session_state.questions = []
         st.session_state.answers = []
         st.session_state.grades = []
+        st.session_state.grade_jobs = []
+        st.session_state.question_prefetch = QuestionPrefetcher(st.session_state.get("tech_stack", tech_stack))
     
-    total = 5
+    total = TOTAL_QUESTIONS
 
     if st.session_state.question_number < total:
         q_number = st.session_state.question_number + 1
         st.subheader(f"Question {q_number} of {total}")
 
         if len(st.session_state.questions) < q_number:
-            question = generate_technical_questions(st.session_state.get("tech_stack", tech_stack), q_number)
+            question = st.session_state.question_prefetch.get(q_number)
             st.session_state.questions.append(question)
         question = st.session_state.questions[q_number - 1]
         st.write(question)
@@ -65,8 +164,7 @@ def run_assessment(mode, tech_stack, prefix="answer"):
         if st.button("Submit", key=f"submit_{prefix}_{q_number}"):
             if answer:
                 st.session_state.answers.append(answer.strip())
-                grade = grade_open_answer(question, answer.strip())
-                st.session_state.grades.append(grade)
+                st.session_state.grade_jobs.append(submit_grade(question, answer.strip()))
                 st.session_state.question_number += 1
                 st.rerun()
             else:
@@ -76,8 +174,23 @@ def run_assessment(mode, tech_stack, prefix="answer"):
         st.success("Congratulations! You have completed all the questions.")
         st.subheader("Your Scores:")
 
-        for i, (ques, ans, grade) in enumerate(zip(st.session_state.questions, st.session_state.answers, st.session_state.grades), 1):
-            data = json.loads(grade)
+        jobs = st.session_state.grade_jobs
+        grades = st.session_state.grades
+        grades.extend([None] * (len(jobs) - len(grades)))
+        errors = {}
+        with st.spinner("Grading your answers..."):
+            for i, job in enumerate(jobs):
+                if grades[i] is None:
+                    grades[i], errors[i] = resolve_grade(job)
+
+        for i, (ques, ans) in enumerate(zip(st.session_state.questions, st.session_state.answers), 1):
+            data = grades[i - 1]
+            if data is None:
+                st.error(f"Q{i} could not be graded ({errors.get(i - 1)}).")
+                if st.button("Retry grading", key=f"regrade_{mode}_{i}"):
+                    jobs[i - 1] = submit_grade(ques, ans)
+                    st.rerun()
+                continue
             st.write(f"""
             **Q{i} Score:** {data["score"]}  
             """)
@@ -86,9 +199,13 @@ def run_assessment(mode, tech_stack, prefix="answer"):
                 st.write(f"**Feedback:** {data['feedback']}")
                 
 
-        total_score = sum(json.loads(g)["score"] for g in st.session_state.grades) / len(st.session_state.grades) 
-        st.subheader(f"""Total Percentage: **{round(total_score,2)}%**""")
-        pdf_data = generate_pdf_report(st.session_state.questions, st.session_state.answers, st.session_state.grades)
+        pdf_data = None
+        if any(g is None for g in grades):
+            st.warning("Your total and report will be available once every answer is graded.")
+        else:
+            total_score = sum(g["score"] for g in grades) / len(grades)
+            st.subheader(f"""Total Percentage: **{round(total_score,2)}%**""")
+            pdf_data = generate_pdf_report(st.session_state.questions, st.session_state.answers, grades)
 
         col1, col2, col3 = st.columns(3, gap="large")
         with col1:
@@ -96,11 +213,13 @@ def run_assessment(mode, tech_stack, prefix="answer"):
                 st.session_state.question_number = 0
                 st.session_state.answers = []
                 st.session_state.grades = []
+                st.session_state.grade_jobs = []
                 st.rerun()
 
         with col2:
             st.download_button("Download Report as PDF",
-                               data=pdf_data,
+                               data=pdf_data or b"",
+                               disabled=pdf_data is None,
                                file_name="assessment_report.pdf",
                                mime="application/pdf", 
                                key=f"download_{mode}", 
@@ -112,4 +231,5 @@ def run_assessment(mode, tech_stack, prefix="answer"):
                 st.session_state.question_number = None
                 st.session_state.answers = []
                 st.session_state.grades = []
+                st.session_state.grade_jobs = []
                 st.rerun()
\ No newline at end of file
@@ -1,80 +1,82 @@
-from rapidfuzz import process
 import textstat
-from sentence_transformers import SentenceTransformer, util
-from src.llm.llama_client import call_llama
-from src.helpers.visuals import make_donut, bar_chart, comparison_chart
-import streamlit as st
-import pandas as pd
-from pathlib import Path
-import json
-
-sbert_model = SentenceTransformer("all-MiniLM-L6-v2")
-
-
-data_path = Path(__file__).resolve().parents[2] / "data" / "skill_normalizer.json"
-with open(data_path, "r") as f:
-    SKILL_NORMALIZER = json.load(f)
-
-data_path = Path(__file__).resolve().parents[2] / "data" / "verbs.json"
-with open(data_path, "r") as f:
-    VERBS = json.load(f)
-ACTION_VERBS = VERBS['ACTION_VERBS']
-IMPACT_WORDS = VERBS['IMPACT_WORDS']
-RESPONSIBLE_WORDS = VERBS['RESPONSIBLE_WORDS']
-SOFT_SKILLS = VERBS['SOFT_SKILLS']
+from src.llm.llama_client import call_llama, stream_llama
+from src.llm.scheduler import llm_priority, BULK
+from src.utils.resources import get_skill_normalizer, get_verbs, get_skill_index, get_sbert_model, get_encoder, get_embedding_cache, get_lexicon_scanner
+from src.utils.lexicon import ResumeFeatures
+from src.utils.jd_store import JDProfile
+from src.utils.compaction import compact_review_inputs
+from src.helpers import tracing
+
+_LAZY_ATTRIBUTES = {
+    "sbert_model": get_sbert_model,
+    "SKILL_NORMALIZER": get_skill_normalizer,
+    "SKILL_INDEX": get_skill_index,
+    "EMBEDDING_CACHE": get_embedding_cache,
+    "VERBS": get_verbs,
+    "ACTION_VERBS": lambda: get_verbs()["ACTION_VERBS"],
+    "IMPACT_WORDS": lambda: get_verbs()["IMPACT_WORDS"],
+    "RESPONSIBLE_WORDS": lambda: get_verbs()["RESPONSIBLE_WORDS"],
+    "SOFT_SKILLS": lambda: get_verbs()["SOFT_SKILLS"],
+}
+
+
+def __getattr__(name):
+    # model and lexicons load on first use, not at import
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def extract_features(text):
+    if isinstance(text, ResumeFeatures):
+        return text
+    return ResumeFeatures(text, get_lexicon_scanner())
 
 
 def check_formatting_issues(text):
+    features = extract_features(text)
     issues = []
-    if "education" not in text.lower():
+    if not features.mentions("education"):
         issues.append("Missing Education section")
     ex = ["experience", "internships", "projects", "work", "research"]
-    i=0
-    while i<=len(ex):
-        if i<len(ex) and ex[i] in text.lower():
-            break
-        elif i<len(ex):
-            i+=1
-        else:
-            issues.append("Missing Experience section")
-    if len(text.split()) < 200:
+    if not any(features.mentions(section) for section in ex):
+        issues.append("Missing Experience section")
+    if features.word_count < 200:
         issues.append("Resume too short (<200 words)")
     return issues
 
 
+@tracing.traced("readability_score")
 def readability_score(text):
+    text = extract_features(text).text
     score = textstat.flesch_reading_ease(text)
     grade = textstat.flesch_kincaid_grade(text)
     return {"ease": score, "grade": grade}
 
 
+@tracing.traced("normalize_skills")
 def normalize_skills(extracted_skills):
-    normalized = []
-    for skill in extracted_skills:
-        key = skill.lower().strip()
-        found = False
-
-        for canonical, aliases in SKILL_NORMALIZER.items():
-            if key == canonical.lower() or key in [a.lower() for a in aliases]:
-                normalized.append(canonical)
-                found = True
-                break
-
-        if not found:
-            all_aliases = {alias.lower(): canonical for canonical, aliases in SKILL_NORMALIZER.items() for alias in aliases}
-            match, score, _ = process.extractOne(key, all_aliases.keys())
-            if score > 80:
-                normalized.append(all_aliases[match])
-            else:
-                normalized.append(skill)
-
+    normalized = get_skill_index().normalize(extracted_skills)
     normalized_unique = list(dict.fromkeys(normalized))
     return normalized_unique
 
 
-def semantic_skill_match(resume_skills, jd_skills, threshold=0.6):
-    resume_emb = sbert_model.encode(resume_skills, convert_to_tensor=True)
-    jd_emb = sbert_model.encode(jd_skills, convert_to_tensor=True)
+@tracing.traced("encode_skills")
+def encode_skills(skills):
+    return get_embedding_cache().get_many(skills, lambda texts: get_encoder().encode(texts, convert_to_numpy=True))
+
+
+@tracing.traced("semantic_skill_match")
+def semantic_skill_match(resume_skills, jd_skills, threshold=0.6, jd_embeddings=None):
+    from sentence_transformers import util
+
+    if jd_embeddings is None:
+        embeddings = encode_skills(list(resume_skills) + list(jd_skills))
+        resume_emb = embeddings[:len(resume_skills)]
+        jd_emb = embeddings[len(resume_skills):]
+    else:
+        resume_emb = encode_skills(resume_skills)
+        jd_emb = jd_embeddings
 
     similarity_matrix = util.cos_sim(resume_emb, jd_emb)
     matched, missing, extra = [], [], []
@@ -89,8 +91,9 @@ def semantic_skill_match(resume_skills, jd_skills, threshold=0.6):
 
 
 def score_clarity(text):
-    count_verbs = sum(text.lower().count(v) for v in ACTION_VERBS)
-    count_numbers = len([w for w in text.split() if any(c.isdigit() for c in w)])
+    features = extract_features(text)
+    count_verbs = features.lexicon_counts["ACTION_VERBS"]
+    count_numbers = features.number_count
     if count_verbs > 10 and count_numbers > 5:
         return 10
     elif count_verbs > 5:
@@ -100,13 +103,14 @@ def score_clarity(text):
 
 
 def score_impact(text):
-    impact = sum(text.lower().count(w) for w in IMPACT_WORDS)
-    weak = sum(text.lower().count(w) for w in RESPONSIBLE_WORDS)
+    features = extract_features(text)
+    impact = features.lexicon_counts["IMPACT_WORDS"]
+    weak = features.lexicon_counts["RESPONSIBLE_WORDS"]
     return min(10, (impact * 2 - weak)) if impact > 0 else 5
 
 
 def score_soft_skills(text):
-    count = sum(text.lower().count(s) for s in SOFT_SKILLS)
+    count = extract_features(text).lexicon_counts["SOFT_SKILLS"]
     if count >= 5:
         return 10
     elif count >= 3:
@@ -116,7 +120,9 @@ def score_soft_skills(text):
     else:
         return 3
     
+@tracing.traced("calculate_soft_factors")
 def calculate_soft_factors(text):
+    text = extract_features(text)
     clarity = score_clarity(text)
     impact = score_impact(text)
     softskills = score_soft_skills(text)
@@ -129,11 +135,16 @@ def calculate_soft_factors(text):
     }
 
 
+@tracing.traced("calculate_ats_score")
 def calculate_ats_score(resume_text, jd_text, text):
     resume_skills = normalize_skills(resume_text["Tech Stack"].split(", "))
-    jd_skills = normalize_skills(jd_text["Tech Stack"].split(", "))
-
-    matched, missing, extra = semantic_skill_match(resume_skills, jd_skills)
+    if isinstance(jd_text, JDProfile):
+        # registered JD: skills and their embeddings were computed once at registration
+        jd_skills = jd_text.skills
+        matched, missing, extra = semantic_skill_match(resume_skills, jd_skills, jd_embeddings=jd_text.embeddings)
+    else:
+        jd_skills = normalize_skills(jd_text["Tech Stack"].split(", "))
+        matched, missing, extra = semantic_skill_match(resume_skills, jd_skills)
     matched_ratio = (len(matched) / len(jd_skills))
     skill_score = min(1, matched_ratio) * 50
     
@@ -148,9 +159,10 @@ def calculate_ats_score(resume_text, jd_text, text):
     
     missing_penalty = (len(missing) / len(jd_skills)) * 5
     
-    issues = check_formatting_issues(text)
-    ease = readability_score(text)["ease"]
-    word_count = len(text.split())
+    features = extract_features(text)
+    issues = check_formatting_issues(features)
+    ease = readability_score(features)["ease"]
+    word_count = features.word_count
 
     format_score = 5
     if ease <= 50:
@@ -162,7 +174,7 @@ def calculate_ats_score(resume_text, jd_text, text):
     elif len(issues) > 10:
         format_score -= 5
 
-    soft_score, soft_details = calculate_soft_factors(text)
+    soft_score, soft_details = calculate_soft_factors(features)
     ats_score = skill_score + exp_score + format_score - missing_penalty + soft_score
     return round(ats_score, 2), {
         "Skill Match": round(skill_score, 2),
@@ -177,8 +189,9 @@ def calculate_ats_score(resume_text, jd_text, text):
     }
 
 
-def generate_resume_review(candidate_info, jd_text):
-    prompt = f"""
+def _review_prompt(candidate_info, jd_text):
+    candidate_info, jd_text = compact_review_inputs(candidate_info, jd_text)
+    return f"""
     You are an experienced Technical Human Resource Manager recruiting fresh graduates. 
     Your task is to review the provided resume {candidate_info} against the job description {jd_text}. 
     Keep in mind fresh graduates may have internship experiences usually.
@@ -187,90 +200,15 @@ def generate_resume_review(candidate_info, jd_text):
     -weaknesses 
     -recommendations in relation to the specified job requirements.
     """
-    return call_llama(prompt)
-
-
-def ats_dashboard(ats, info, resume_text, jd):
-    skill_match = (info["Skill Match"]/50)*100
-    exp_match = (info["Experience Match"]/25)*100
-    format_score = (info["Formatting & Readability"]/10)*100
-    soft_score = (info["Soft Skills & Clarity"]/15)*100
-    soft_details = info["Soft Skill Details"]
-    issues = info["Formatting Issues"]
-    matched = info["Matched Skills"]
-    missing = info["Missing Skills"]
-    extra = info["Extra Skills"]
-
-    st.title("📊 Resume Analysis Dashboard")
-
-    col1, col2 = st.columns([1, 2])
-    with col1:
-        st.altair_chart(make_donut(ats, "Percentage Match"), use_container_width=False)
-        verdict = "✅ Strong Fit" if ats >= 70 else "⚠️ Partial Match" if ats >= 50 else "❌ Needs Improvement"
-        st.subheader(verdict)
-
-    with col2:
-        scores_df = pd.DataFrame({
-            "Component": ["Skill Match", "Experience Match", "Soft Skills", "Formatting"],
-            "Score": [skill_match, exp_match, soft_score, format_score]
-        })
-        st.altair_chart(bar_chart(scores_df,"Score:Q","Component:N"), use_container_width=True)
-        
-        st.write(f"**Skill match score:** {skill_match:.2f} %")
-        st.write(f"**Experience score:** {exp_match:.2f} %")
-        st.write(f"**Format score:** {format_score:.2f} %")
-        st.write(f"**Soft skills & clarity score:** {soft_score:.2f} %")
-
-    st.divider()
-
-    st.header("Skills Analysis")
-
-    col1, col2 = st.columns([2,1], gap="large")
-    with col1:
-        st.subheader("Matched Skills")
-        if matched:
-            st.markdown(" ".join([f"<code style='color:green; background-color:#eaffea; padding:2px 4px; border-radius:4px;'>{skill}</code>" for skill in matched]),
-                        unsafe_allow_html=True)
-        else:
-            st.info("No skills matched.")
-
-        st.subheader("Missing Skills")
-        if missing:
-            st.markdown(" ".join([f"<code style='color:red; background-color:#ffe6e6; padding:2px 4px; border-radius:4px;'>{skill}</code>" for skill in missing]),
-                        unsafe_allow_html=True)
-        else:
-            st.success("No missing skills.")
-
-        if extra:
-            st.subheader("Additional Skills")
-            st.markdown(" ".join([f"<code style='color:blue; background-color:#e6f7ff; padding:2px 4px; border-radius:4px;'>{skill}</code>" for skill in extra]),
-                        unsafe_allow_html=True)
-
-    with col2:
-        skill_data = pd.DataFrame({
-        "Category": ["Matched Skills", "Missing Skills"],
-        "Count": [len(matched), len(missing)]
-        })
-        st.altair_chart(comparison_chart(skill_data), use_container_width=True)
-        st.text(f"Total required skills: {len(matched)+len(missing)}\nMatched: {len(matched)}\nMissing: {len(missing)}")
 
 
-    st.divider()
-
-    st.header("Readability & Formatting")
-    st.write("Detected soft skills and how well they're conveyed:")
-
-    for skill, detail in soft_details.items():
-        st.write(f"- **{skill}**: {detail}/10")
-
-    if issues:
-        st.write("Some formatting issues were detected:")
-        for issue in issues:
-            st.write(f"- **{issue}**")
-    else:
-        st.success("No major formatting issues found ✅")
+@tracing.traced("generate_resume_review")
+def generate_resume_review(candidate_info, jd_text):
+    # reviews can wait behind live assessment calls
+    with llm_priority(BULK):
+        return call_llama(_review_prompt(candidate_info, jd_text))
 
-    st.divider()
 
-    st.header("Review Summary")
-    st.write(generate_resume_review(resume_text, jd))
+def stream_resume_review(candidate_info, jd_text):
+    with tracing.generator_span("generate_resume_review", stream=True):
+        yield from stream_llama(_review_prompt(candidate_info, jd_text), priority=BULK)
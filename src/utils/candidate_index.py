@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+from pathlib import Path
+import numpy as np
+from src.utils.resources import ENCODER_ID
+
+CANDIDATE_INDEX_DIR = Path(os.environ.get("CANDIDATE_INDEX_DIR", Path(__file__).resolve().parents[2] / ".cache" / "candidate_index"))
+
+
+class CandidateIndex:
+    # Each distinct canonical skill is embedded and stored once (vocab.f32); candidates are stored
+    # as lists of skill ids, so a query is one small vocab x JD matmul plus a gather and segmented max.
+    # meta.json names the encoder behind vocab.f32; opening the index with another one re-embeds the vocab.
+    def __init__(self, root=CANDIDATE_INDEX_DIR, dim=384, model=ENCODER_ID, encode=None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.model = model
+        self.encode = encode
+        self.vocab_path = self.root / "vocab.jsonl"
+        self.vectors_path = self.root / "vocab.f32"
+        self.records_path = self.root / "candidates.jsonl"
+        self.meta_path = self.root / "meta.json"
+        self.lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.vocab = {}
+        self.vocab_skills = []
+        self.vocab_vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self.ids = []
+        self.details = []
+        self.starts = []
+        self.counts = []
+        self.alive = []
+        self.slots = {}
+        self.flat = np.zeros(1024, dtype=np.int32)
+        self.rows = 0
+        self._arrays = None
+
+    def _load(self):
+        if self.vocab_path.exists():
+            with open(self.vocab_path, "r") as f:
+                skills = [json.loads(line) for line in f if line.endswith("\n")]
+            vectors = np.fromfile(self.vectors_path, dtype=np.float32) if self.vectors_path.exists() else np.zeros(0, np.float32)
+            # an interrupted add may leave one file longer than the other
+            size = min(len(skills), len(vectors) // self.dim)
+            self.vocab_skills = skills[:size]
+            self.vocab = {skill: i for i, skill in enumerate(self.vocab_skills)}
+            self.vocab_vectors = vectors[:size * self.dim].reshape(size, self.dim)
+        if self._stored_model() != self.model:
+            self._reembed()
+        elif not self.meta_path.exists():
+            self._write_meta()
+        if self.records_path.exists():
+            with open(self.records_path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get("removed"):
+                        self._mark_removed(record["id"])
+                    elif all(i < len(self.vocab_skills) for i in record["skill_ids"]):
+                        self._add_slot(record)
+
+    def _stored_model(self):
+        if self.meta_path.exists():
+            with open(self.meta_path, "r") as f:
+                return json.load(f)["model"]
+        # indexes written before meta.json carry the encoder on each record
+        if self.records_path.exists():
+            with open(self.records_path, "r") as f:
+                for line in f:
+                    try:
+                        return json.loads(line)["model"]
+                    except (json.JSONDecodeError, KeyError):
+                        continue
+        return None
+
+    def _normalize(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        # unit rows, so a dot product is the cosine similarity
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _reembed(self):
+        # skill ids stay the same; only their vectors are recomputed with the current encoder
+        if self.vocab_skills:
+            if self.encode is None:
+                from src.utils.ats import encode_skills
+                self.encode = encode_skills
+            self.vocab_vectors = self._normalize(self.encode(self.vocab_skills))
+            tmp_path = self.vectors_path.with_suffix(".tmp")
+            self.vocab_vectors.tofile(tmp_path)
+            os.replace(tmp_path, self.vectors_path)
+            with open(self.vocab_path, "w") as f:
+                for skill in self.vocab_skills:
+                    f.write(json.dumps(skill) + "\n")
+        self._write_meta()
+
+    def _write_meta(self):
+        tmp_path = self.meta_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"model": self.model, "dim": self.dim}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _add_slot(self, record):
+        self._mark_removed(record["id"])
+        skill_ids = record["skill_ids"]
+        if self.rows + len(skill_ids) > len(self.flat):
+            grown = np.zeros(max(2 * len(self.flat), self.rows + len(skill_ids)), dtype=np.int32)
+            grown[:self.rows] = self.flat[:self.rows]
+            self.flat = grown
+        self.flat[self.rows:self.rows + len(skill_ids)] = skill_ids
+        self.slots[record["id"]] = len(self.ids)
+        self.ids.append(record["id"])
+        self.details.append({"resume_info": record.get("resume_info"), "text": record.get("text")})
+        self.starts.append(self.rows)
+        self.counts.append(len(skill_ids))
+        self.alive.append(True)
+        self.rows += len(skill_ids)
+        self._arrays = None
+
+    def _mark_removed(self, candidate_id):
+        slot = self.slots.pop(candidate_id, None)
+        if slot is not None:
+            self.alive[slot] = False
+            self._arrays = None
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self.slots
+
+    def skills_of(self, candidate_id):
+        slot = self.slots[candidate_id]
+        return [self.vocab_skills[i] for i in self.flat[self.starts[slot]:self.starts[slot] + self.counts[slot]]]
+
+    def add(self, candidate_id, resume_info, text=None):
+        from src.utils.ats import normalize_skills, encode_skills
+        skills = normalize_skills(resume_info["Tech Stack"].split(", "))
+        self.add_skills(candidate_id, skills, encode_skills, resume_info, text)
+
+    def add_skills(self, candidate_id, skills, encode, resume_info=None, text=None):
+        skills = list(dict.fromkeys(skills))
+        with self.lock:
+            new_skills = [skill for skill in skills if skill not in self.vocab]
+        if new_skills:
+            vectors = self._normalize(encode(new_skills))
+
+        with self.lock:
+            fresh = [(skill, vector) for skill, vector in zip(new_skills, vectors)
+                     if skill not in self.vocab] if new_skills else []
+            if fresh:
+                with open(self.vectors_path, "ab") as f:
+                    f.write(np.stack([vector for _, vector in fresh]).tobytes())
+                with open(self.vocab_path, "a") as f:
+                    for skill, _ in fresh:
+                        f.write(json.dumps(skill) + "\n")
+                for skill, _ in fresh:
+                    self.vocab[skill] = len(self.vocab_skills)
+                    self.vocab_skills.append(skill)
+                self.vocab_vectors = np.concatenate([self.vocab_vectors, np.stack([v for _, v in fresh])])
+
+            record = {"id": candidate_id, "model": self.model, "skill_ids": [self.vocab[s] for s in skills],
+                      "resume_info": resume_info, "text": text}
+            with open(self.records_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+            self._add_slot(record)
+
+    def remove(self, candidate_id):
+        with self.lock:
+            if candidate_id not in self.slots:
+                return False
+            with open(self.records_path, "a") as f:
+                f.write(json.dumps({"id": candidate_id, "removed": True}) + "\n")
+            self._mark_removed(candidate_id)
+            return True
+
+    def compact(self):
+        with self.lock:
+            tmp_path = self.records_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                for slot, candidate_id in enumerate(self.ids):
+                    if not self.alive[slot]:
+                        continue
+                    skill_ids = self.flat[self.starts[slot]:self.starts[slot] + self.counts[slot]].tolist()
+                    f.write(json.dumps({"id": candidate_id, "model": self.model, "skill_ids": skill_ids,
+                                        **self.details[slot]}) + "\n")
+            os.replace(tmp_path, self.records_path)
+            self._reset()
+            self._load()
+
+    def _query_arrays(self):
+        if self._arrays is None:
+            starts = np.asarray(self.starts, dtype=np.int64)
+            counts = np.asarray(self.counts, dtype=np.int64)
+            ranked = np.flatnonzero(np.asarray(self.alive, dtype=bool) & (counts > 0))
+            starts, counts = starts[ranked], counts[ranked]
+            segments = np.append(0, np.cumsum(counts[:-1]))
+            rows = np.repeat(starts - segments, counts) + np.arange(counts.sum())
+            self._arrays = ranked, self.flat[rows], segments
+        return self._arrays
+
+    def rank(self, jd_embeddings, k=20, threshold=0.6):
+        jd_emb = np.asarray(jd_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(jd_emb, axis=1, keepdims=True)
+        jd_emb = jd_emb / np.where(norms == 0, 1, norms)
+        with self.lock:
+            ranked, skill_ids, segments = self._query_arrays()
+            vocab_vectors = self.vocab_vectors
+            ids = self.ids
+
+        k = min(k, len(ranked))
+        if k == 0:
+            return []
+        skill_sims = vocab_vectors @ jd_emb.T
+        best = np.maximum.reduceat(skill_sims[skill_ids], segments, axis=0)
+        scores = (best >= threshold).mean(axis=1) + 0.01 * best.mean(axis=1)
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(ids[ranked[i]], float(scores[i])) for i in top]
+
+    def shortlist(self, jd, k=20, threshold=0.6):
+        from src.utils.ats import normalize_skills, encode_skills, calculate_ats_score
+        from src.utils.jd_store import JDProfile
+        if isinstance(jd, JDProfile):
+            jd_embeddings = jd.embeddings
+        else:
+            jd_embeddings = encode_skills(normalize_skills(jd["Tech Stack"].split(", ")))
+
+        results = []
+        for candidate_id, rank_score in self.rank(jd_embeddings, k, threshold):
+            with self.lock:
+                slot = self.slots.get(candidate_id)
+                detail = self.details[slot] if slot is not None else None
+            # removed since it was ranked, or added with add_skills and nothing to score
+            if detail is None or detail["resume_info"] is None:
+                continue
+            ats, info = calculate_ats_score(detail["resume_info"], jd, detail["text"] or "")
+            results.append({"id": candidate_id, "rank_score": round(rank_score, 4), "ats_score": ats, "breakdown": info})
+        return sorted(results, key=lambda r: r["ats_score"], reverse=True)
@@ -0,0 +1,172 @@
+import json
+import os
+import re
+from collections import Counter
+
+PROMPT_COMPACTION = os.environ.get("PROMPT_COMPACTION", "1") == "1"
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET", 1500))
+
+# headings of the sections check_formatting_issues looks for, plus the other usual ones
+SECTION_KEYWORDS = {
+    "education": ["education", "academic", "qualifications"],
+    "experience": ["experience", "employment", "work history", "professional experience"],
+    "internships": ["internships", "internship"],
+    "projects": ["projects", "project"],
+    "work": ["work"],
+    "research": ["research", "publications"],
+    "skills": ["skills", "technical skills", "technologies", "tech stack", "tools"],
+    "summary": ["summary", "objective", "profile", "about me"],
+    "certifications": ["certifications", "certificates", "courses"],
+    "achievements": ["achievements", "awards", "honors"],
+    "extras": ["hobbies", "interests", "languages", "extracurricular", "activities", "declaration", "references"],
+}
+FIELD_SECTIONS = {
+    "Full Name": ["header"],
+    "Email Address": ["header"],
+    "Phone Number": ["header"],
+    "Current Location": ["header"],
+    "Years of Experience": ["experience", "work", "internships", "summary"],
+    "Desired Position(s)": ["summary", "experience", "work"],
+    "Tech Stack": ["skills", "projects", "experience", "internships", "work", "research", "certifications"],
+}
+REVIEW_FIELDS = ["Years of Experience", "Desired Position(s)", "Tech Stack"]
+
+# extract_text_from_pdf puts a form feed between pages
+PAGE_BREAK = "\f"
+PAGE_EDGE_LINES = 3
+
+BOILERPLATE = re.compile(
+    r"^(?:page \d+(?: of \d+)?|\d+ of \d+|curriculum vitae|resume|references available (?:up)?on request.*"
+    r"|i hereby declare.*|declaration|.*all the above information is true.*)$",
+    re.IGNORECASE)
+# three or more short comma-separated items, the way skills are usually listed
+LIST_LINE = re.compile(r"^[^,]{1,40}(?:,[^,]{1,40}){2,}$")
+
+
+def approx_tokens(text):
+    # about four characters per token, same estimate the LLM scheduler uses
+    return len(text) // 4
+
+
+def _heading(line):
+    words = line.lower().strip(" :").split()
+    if not words or len(words) > 4:
+        return None
+    heading = " ".join(words)
+    for section, keywords in SECTION_KEYWORDS.items():
+        if any(heading == k or heading.startswith(k + " ") or heading.endswith(" " + k) for k in keywords):
+            return section
+    return None
+
+
+def _edge(page, i):
+    return i < PAGE_EDGE_LINES or i >= len(page) - PAGE_EDGE_LINES
+
+
+def clean_lines(text):
+    pages = [[" ".join(line.split()) for line in page.splitlines()] for page in text.split(PAGE_BREAK)]
+    pages = [[line for line in page if line] for page in pages]
+    # running headers and footers open or close several pages; a line repeated inside a page is content
+    edges = Counter(key for page in pages for key in {line.lower() for i, line in enumerate(page) if _edge(page, i)})
+    seen = set()
+    lines = []
+    for page in pages:
+        for i, line in enumerate(page):
+            key = line.lower()
+            if BOILERPLATE.match(line):
+                continue
+            if edges[key] > 1 and _edge(page, i):
+                # the first copy stays: page headers usually carry the name and contact details
+                if key in seen:
+                    continue
+                seen.add(key)
+            lines.append(line)
+    return lines
+
+
+def _fit(body, allowance):
+    # the heading and any list lines go in first, so a long section cut from its head still keeps
+    # its skills; then the body from the top until the allowance runs out
+    first = [j for j, line in enumerate(body) if j == 0 or LIST_LINE.match(line)]
+    chosen, used = set(), 0
+    for j in first:
+        if used + len(body[j]) + 1 <= allowance:
+            chosen.add(j)
+            used += len(body[j]) + 1
+    for j, line in enumerate(body):
+        if j in chosen:
+            continue
+        if used + len(line) + 1 > allowance:
+            break
+        chosen.add(j)
+        used += len(line) + 1
+    return [body[j] for j in sorted(chosen)], used
+
+
+def split_sections(lines):
+    sections = [["header", []]]
+    for line in lines:
+        section = _heading(line)
+        if section:
+            sections.append([section, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [(name, body) for name, body in sections if body]
+
+
+def compact_resume(text, fields=None, budget=None):
+    budget = budget or PROMPT_TOKEN_BUDGET
+    if not PROMPT_COMPACTION or approx_tokens(text) <= budget:
+        return text
+    lines = clean_lines(text)
+    compacted = "\n".join(lines)
+    if approx_tokens(compacted) <= budget:
+        return compacted
+
+    sections = split_sections(lines)
+    wanted = ["header"]
+    for field in fields or FIELD_SECTIONS:
+        for section in FIELD_SECTIONS.get(field, []):
+            if section not in wanted:
+                wanted.append(section)
+    relevant = [i for i, (name, _) in enumerate(sections) if name in wanted]
+    sizes = {i: sum(len(line) + 1 for line in sections[i][1]) for i in relevant}
+
+    # share the budget between the relevant sections so one long section cannot starve the others:
+    # small sections take what they need and pass the rest on to the larger ones
+    remaining = budget * 4
+    allowance = {}
+    for count, i in enumerate(sorted(relevant, key=sizes.get)):
+        allowance[i] = min(sizes[i], remaining // (len(relevant) - count))
+        remaining -= allowance[i]
+
+    kept = {}
+    for i in relevant:
+        kept[i], used = _fit(sections[i][1], allowance[i])
+        remaining += allowance[i] - used
+
+    # whatever is left goes to the other sections, in document order
+    for i, (name, body) in enumerate(sections):
+        if i in kept:
+            continue
+        kept[i] = []
+        for line in body:
+            if len(line) + 1 > remaining:
+                break
+            kept[i].append(line)
+            remaining -= len(line) + 1
+    # a heading whose body did not fit only tells the model the section exists
+    for i, (name, body) in enumerate(sections):
+        if name != "header" and len(kept[i]) == 1 < len(body):
+            kept[i] = []
+    return "\n".join(line for i in sorted(kept) for line in kept[i])
+
+
+def compact_review_inputs(candidate_info, jd_info):
+    # contact details do not change a review; the JD profile carries only its parsed fields
+    jd_info = getattr(jd_info, "jd_info", jd_info)
+    if not PROMPT_COMPACTION:
+        return candidate_info, jd_info
+    candidate = {field: candidate_info[field] for field in REVIEW_FIELDS if candidate_info.get(field)}
+    jd = {field: value for field, value in jd_info.items() if value}
+    return json.dumps(candidate, ensure_ascii=False), json.dumps(jd, ensure_ascii=False)
@@ -0,0 +1,99 @@
+from src.helpers.visuals import make_donut, bar_chart, comparison_chart
+from src.helpers import tracing
+import streamlit as st
+import pandas as pd
+
+
+def ats_dashboard(ats, info, review):
+    skill_match = (info["Skill Match"]/50)*100
+    exp_match = (info["Experience Match"]/25)*100
+    format_score = (info["Formatting & Readability"]/10)*100
+    soft_score = (info["Soft Skills & Clarity"]/15)*100
+    soft_details = info["Soft Skill Details"]
+    issues = info["Formatting Issues"]
+    matched = info["Matched Skills"]
+    missing = info["Missing Skills"]
+    extra = info["Extra Skills"]
+
+    with tracing.span("build_charts"):
+        donut = make_donut(ats, "Percentage Match")
+        scores_df = pd.DataFrame({
+            "Component": ["Skill Match", "Experience Match", "Soft Skills", "Formatting"],
+            "Score": [skill_match, exp_match, soft_score, format_score]
+        })
+        bars = bar_chart(scores_df,"Score:Q","Component:N")
+        skill_data = pd.DataFrame({
+        "Category": ["Matched Skills", "Missing Skills"],
+        "Count": [len(matched), len(missing)]
+        })
+        comparison = comparison_chart(skill_data)
+
+    st.title("📊 Resume Analysis Dashboard")
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.altair_chart(donut, use_container_width=False)
+        verdict = "✅ Strong Fit" if ats >= 70 else "⚠️ Partial Match" if ats >= 50 else "❌ Needs Improvement"
+        st.subheader(verdict)
+
+    with col2:
+        st.altair_chart(bars, use_container_width=True)
+        
+        st.write(f"**Skill match score:** {skill_match:.2f} %")
+        st.write(f"**Experience score:** {exp_match:.2f} %")
+        st.write(f"**Format score:** {format_score:.2f} %")
+        st.write(f"**Soft skills & clarity score:** {soft_score:.2f} %")
+
+    st.divider()
+
+    st.header("Skills Analysis")
+
+    col1, col2 = st.columns([2,1], gap="large")
+    with col1:
+        st.subheader("Matched Skills")
+        if matched:
+            st.markdown(" ".join([f"<code style='color:green; background-color:#eaffea; padding:2px 4px; border-radius:4px;'>{skill}</code>" for skill in matched]),
+                        unsafe_allow_html=True)
+        else:
+            st.info("No skills matched.")
+
+        st.subheader("Missing Skills")
+        if missing:
+            st.markdown(" ".join([f"<code style='color:red; background-color:#ffe6e6; padding:2px 4px; border-radius:4px;'>{skill}</code>" for skill in missing]),
+                        unsafe_allow_html=True)
+        else:
+            st.success("No missing skills.")
+
+        if extra:
+            st.subheader("Additional Skills")
+            st.markdown(" ".join([f"<code style='color:blue; background-color:#e6f7ff; padding:2px 4px; border-radius:4px;'>{skill}</code>" for skill in extra]),
+                        unsafe_allow_html=True)
+
+    with col2:
+        st.altair_chart(comparison, use_container_width=True)
+        st.text(f"Total required skills: {len(matched)+len(missing)}\nMatched: {len(matched)}\nMissing: {len(missing)}")
+
+
+    st.divider()
+
+    st.header("Readability & Formatting")
+    st.write("Detected soft skills and how well they're conveyed:")
+
+    for skill, detail in soft_details.items():
+        st.write(f"- **{skill}**: {detail}/10")
+
+    if issues:
+        st.write("Some formatting issues were detected:")
+        for issue in issues:
+            st.write(f"- **{issue}**")
+    else:
+        st.success("No major formatting issues found ✅")
+
+    st.divider()
+
+    st.header("Review Summary")
+    if isinstance(review, str):
+        st.write(review)
+    else:
+        review = st.write_stream(review)
+    return review
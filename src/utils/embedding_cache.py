@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+CACHE_DIR = Path(os.environ.get("EMBEDDING_CACHE_DIR", Path(__file__).resolve().parents[2] / ".cache" / "embeddings"))
+# keys.log is folded into index.json once it holds this many keys, or a quarter of the cache if that is more
+COMPACT_MIN_KEYS = 1024
+
+
+def normalize_text(text):
+    return " ".join(str(text).split())
+
+
+class _FileLock:
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        self.handle = open(self.path, "a")
+        if fcntl:
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl:
+            fcntl.flock(self.handle, fcntl.LOCK_UN)
+        self.handle.close()
+
+
+class EmbeddingCache:
+    # Row i of vectors.f32 belongs to the i-th key of index.json followed by keys.log. A flush
+    # appends its vectors and keys; the log is folded back into index.json now and then, so a
+    # miss costs the new keys rather than a rewrite of every key.
+    def __init__(self, model_name, cache_dir=CACHE_DIR, max_memory_items=4096):
+        self.model_name = model_name
+        self.max_memory_items = max_memory_items
+        self.path = Path(cache_dir) / model_name.replace("/", "__")
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.path / "vectors.f32"
+        self.index_path = self.path / "index.json"
+        self.log_path = self.path / "keys.log"
+        self.lock_path = self.path / "cache.lock"
+
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.dim = None
+        self.rows = {}
+        self._matrix = None
+        self._index_id = None
+        self._log_offset = 0
+        self._log_keys = 0
+        with _FileLock(self.lock_path):
+            self._load_index()
+
+    def key(self, text):
+        return hashlib.sha1(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _index_ident(self):
+        try:
+            stat = self.index_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _load_index(self):
+        self._index_id = self._index_ident()
+        if self._index_id is not None:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+            self.dim = data["dim"]
+            self.rows = data["rows"]
+        else:
+            self.dim = None
+            self.rows = {}
+        self._log_offset = 0
+        self._log_keys = 0
+        self._read_log()
+
+    def _read_log(self):
+        # keys appended since we last looked, by this or another process
+        if self.log_path.exists():
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                # a key cut short by an interrupted flush
+                with open(self.log_path, "r+b") as f:
+                    f.truncate(self._log_offset + end)
+            for key in data[:end].decode("ascii").splitlines():
+                self.rows[key] = len(self.rows)
+            self._log_offset += end
+            self._log_keys += data.count(b"\n", 0, end)
+        # rows appended without their keys belong to an interrupted flush
+        if self.vectors_path.exists():
+            size = len(self.rows) * (self.dim or 0) * 4
+            if self.vectors_path.stat().st_size != size:
+                with open(self.vectors_path, "r+b") as f:
+                    f.truncate(size)
+        self._matrix = None
+
+    def _refresh(self):
+        # another process may have appended keys, or folded the log into a new index.json
+        if self._index_ident() != self._index_id:
+            self._load_index()
+        else:
+            self._read_log()
+
+    def _compact(self):
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"model": self.model_name, "dim": self.dim, "rows": self.rows}, f)
+        # the log is emptied first: a crash in between loses recent keys, never misnumbers rows
+        open(self.log_path, "w").close()
+        os.replace(tmp_path, self.index_path)
+        self._index_id = self._index_ident()
+        self._log_offset = 0
+        self._log_keys = 0
+
+    def _disk_matrix(self):
+        if self._matrix is None or self._matrix.shape[0] != len(self.rows):
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.rows), self.dim))
+        return self._matrix
+
+    def _remember(self, key, vector):
+        self.memory[key] = vector
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_items:
+            self.memory.popitem(last=False)
+
+    def _persist(self, fresh):
+        with _FileLock(self.lock_path):
+            self._refresh()
+            new = [(k, v) for k, v in fresh.items() if k not in self.rows]
+            if not new:
+                return
+            if self.dim is None:
+                self.dim = int(new[0][1].shape[0])
+            with open(self.vectors_path, "ab") as f:
+                for k, v in new:
+                    f.write(np.ascontiguousarray(v, dtype=np.float32).tobytes())
+            keys = "".join(k + "\n" for k, _ in new).encode("ascii")
+            with open(self.log_path, "ab") as f:
+                f.write(keys)
+            for k, _ in new:
+                self.rows[k] = len(self.rows)
+            self._log_offset += len(keys)
+            self._log_keys += len(new)
+            if self._index_id is None or self._log_keys >= max(COMPACT_MIN_KEYS, len(self.rows) // 4):
+                self._compact()
+            self._matrix = None
+
+    def get_many(self, texts, encode):
+        texts = [normalize_text(t) for t in texts]
+        if not texts:
+            return np.asarray(encode([]), dtype=np.float32)
+
+        keys = [self.key(t) for t in texts]
+        vectors = [None] * len(texts)
+        with self.lock:
+            for i, k in enumerate(keys):
+                vector = self.memory.get(k)
+                if vector is not None:
+                    self.memory.move_to_end(k)
+                    self.hits += 1
+                    vectors[i] = vector
+                    continue
+                row = self.rows.get(k)
+                if row is not None:
+                    vector = np.array(self._disk_matrix()[row])
+                    self._remember(k, vector)
+                    self.disk_hits += 1
+                    vectors[i] = vector
+
+        missing = OrderedDict()
+        for i, k in enumerate(keys):
+            if vectors[i] is None:
+                missing.setdefault(k, texts[i])
+
+        if missing:
+            encoded = np.asarray(encode(list(missing.values())), dtype=np.float32)
+            fresh = dict(zip(missing.keys(), encoded))
+            with self.lock:
+                self.misses += len(missing)
+                self._persist(fresh)
+                for k, vector in fresh.items():
+                    self._remember(k, vector)
+            for i, k in enumerate(keys):
+                if vectors[i] is None:
+                    vectors[i] = fresh[k]
+
+        return np.stack(vectors)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "model": self.model_name,
+                "memory_hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory_items": len(self.memory),
+                "disk_items": len(self.rows),
+            }
+
+    def counters(self):
+        with self.lock:
+            counts = {"memory_hit": self.hits, "disk_hit": self.disk_hits, "miss": self.misses}
+        return [("embedding_cache_lookups_total", {"model": self.model_name, "result": result}, count)
+                for result, count in counts.items()]
@@ -0,0 +1,90 @@
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+ENCODER_BATCHING = os.environ.get("ENCODER_BATCHING", "1") == "1"
+ENCODER_BATCH_WINDOW_MS = float(os.environ.get("ENCODER_BATCH_WINDOW_MS", 5))
+ENCODER_MAX_BATCH = int(os.environ.get("ENCODER_MAX_BATCH", 64))
+ENCODER_THREADS = int(os.environ.get("ENCODER_THREADS", 0))
+
+
+class _EncodeRequest:
+    __slots__ = ("texts", "done", "result", "error")
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class BatchingEncoder:
+    # Callers block in encode() while one worker thread gathers their requests for up to
+    # max_wait_ms (or max_batch_size texts), runs a single forward pass and hands each
+    # caller back its own rows.
+    def __init__(self, model, max_wait_ms=ENCODER_BATCH_WINDOW_MS, max_batch_size=ENCODER_MAX_BATCH):
+        self.model = model
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.requests = queue.Queue()
+        self.batches = 0
+        self.batched_texts = 0
+        self._worker = threading.Thread(target=self._run, name="batching-encoder", daemon=True)
+        self._worker.start()
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        if isinstance(texts, str):
+            return self.encode([texts], convert_to_numpy, **kwargs)[0]
+        if kwargs or not convert_to_numpy:
+            # unusual options go straight to the model rather than being mixed into a shared batch
+            return self.model.encode(texts, convert_to_numpy=convert_to_numpy, **kwargs)
+        request = _EncodeRequest(list(texts))
+        if not request.texts:
+            return self.model.encode(request.texts, convert_to_numpy=True)
+        self.requests.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _collect(self):
+        batch = [self.requests.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._encode_batch(batch)
+            except BaseException as e:
+                # anything, even a KeyboardInterrupt, fails this batch's callers instead of
+                # killing the worker and leaving them, and everyone after them, waiting forever
+                for request in batch:
+                    if not request.done.is_set():
+                        request.error = e
+                        request.done.set()
+
+    def _encode_batch(self, batch):
+        # concurrent sessions often ask for the same skills
+        unique = list(dict.fromkeys(text for request in batch for text in request.texts))
+        vectors = np.asarray(self.model.encode(unique, convert_to_numpy=True, batch_size=max(len(unique), 1)))
+        rows = {text: i for i, text in enumerate(unique)}
+        self.batches += 1
+        self.batched_texts += len(unique)
+        for request in batch:
+            request.result = vectors[[rows[text] for text in request.texts]]
+            request.done.set()
@@ -0,0 +1,130 @@
+import re
+from src.utils.lexicon import build_trie_pattern
+from src.utils.parser import DISALLOWED_CHARS, extract_with_kimi
+from src.utils.compaction import compact_resume
+from src.utils.resources import load_once, get_skill_normalizer, get_skill_index
+from src.helpers import tracing
+
+CANDIDATE_FIELDS = [
+    "Full Name",
+    "Email Address",
+    "Phone Number",
+    "Years of Experience",
+    "Desired Position(s)",
+    "Current Location",
+    "Tech Stack",
+]
+SCORING_FIELDS = ["Years of Experience", "Tech Stack"]
+
+FIELDS_PROMPT = """
+    You are an expert Resume Parser. Extract only the following details correctly from this resume text (each in single line):
+{fields}
+    Resume Text:
+    {text}
+    Answer only the above points each in single sentence. Do not write additional statements. Whole output should be JSON dictionary.
+    """
+
+EMAIL = re.compile(r"[A-Za-z0-9.+]+@[A-Za-z0-9]+(?:\.[A-Za-z0-9]+)+")
+PHONE = re.compile(r"(?<![\d])\+?\d[\d ]{8,16}\d(?![\d])")
+YEARS = re.compile(r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)(?:\s+of)?(?:\s+\w+){0,2}?\s+experience"
+                   r"|experience\s+of\s+(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)", re.IGNORECASE)
+NAME = re.compile(r"^[A-Z][a-zA-Z.]*(?: [A-Z][a-zA-Z.]*){1,3}$")
+
+
+class SkillScanner:
+    # Aliases of one or two characters ("py", "np", "tf") are too ambiguous in free text;
+    # short canonical names ("C") are only matched with their exact casing.
+    def __init__(self, normalizer, skill_index):
+        self.canonical = dict(skill_index.exact)
+        # PDF text has already lost characters such as "-", so "scikit-learn" arrives as "scikitlearn"
+        for term, canonical in skill_index.exact.items():
+            self.canonical.setdefault(DISALLOWED_CHARS.sub("", term), canonical)
+        long_terms = sorted(term for term in self.canonical if len(term) > 2)
+        short_terms = sorted(canonical for canonical in normalizer if len(canonical) <= 2)
+        self.pattern = re.compile(r"(?<![a-z0-9+])(" + build_trie_pattern(long_terms) + r")(?![a-z0-9+])")
+        self.short_pattern = re.compile(r"(?<![A-Za-z0-9+])(" + "|".join(map(re.escape, short_terms)) + r")(?![A-Za-z0-9+])") \
+            if short_terms else None
+
+    def scan(self, text):
+        hits = [(m.start(), self.canonical[m.group(1)]) for m in self.pattern.finditer(text.lower())]
+        if self.short_pattern is not None:
+            hits += [(m.start(), self.canonical[m.group(1).lower()]) for m in self.short_pattern.finditer(text)]
+        return list(dict.fromkeys(canonical for _, canonical in sorted(hits)))
+
+
+def get_skill_scanner():
+    return load_once("skill_scanner", lambda: SkillScanner(get_skill_normalizer(), get_skill_index()))
+
+
+def extract_email(text):
+    match = EMAIL.search(text)
+    return match.group(0).strip(".") if match else None
+
+
+def extract_phone(text):
+    for match in PHONE.finditer(text):
+        digits = re.sub(r"\D", "", match.group(0))
+        if 10 <= len(digits) <= 13:
+            return match.group(0).strip()
+    return None
+
+
+def extract_years_of_experience(text):
+    years = [float(a or b) for a, b in YEARS.findall(text)]
+    if not years:
+        return None
+    value = max(years)
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+def extract_name(text):
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if line:
+            return line if NAME.match(line) else None
+    return None
+
+
+RULES = {
+    "Full Name": extract_name,
+    "Email Address": extract_email,
+    "Phone Number": extract_phone,
+    "Years of Experience": extract_years_of_experience,
+    "Tech Stack": lambda text: ", ".join(get_skill_scanner().scan(text)) or None,
+}
+# Desired Position(s) and Current Location have no rule, so asking for them always means an LLM call
+RULE_FIELDS = list(RULES)
+
+
+def extract_by_rules(text, fields=None):
+    # only the fields the rules actually found
+    info = {}
+    for field in fields or CANDIDATE_FIELDS:
+        rule = RULES.get(field)
+        value = rule(text) if rule else None
+        if value is not None:
+            info[field] = value
+    return info
+
+
+@tracing.traced("extract_candidate_info_fast")
+def extract_candidate_info_fast(text, fields=None, llm_fallback=True):
+    # by default only the fields a rule can fill, so the LLM is called just for the ones it missed
+    fields = fields or RULE_FIELDS
+    info = extract_by_rules(text, fields)
+
+    missing = [field for field in fields if field not in info]
+    if missing and llm_fallback:
+        bullets = "\n".join(f"    - {field}" for field in missing)
+        parsed = extract_with_kimi(FIELDS_PROMPT.replace("{fields}", bullets), compact_resume(text, missing))
+        for field in missing:
+            if field in parsed:
+                info[field] = parsed[field]
+    elif "Years of Experience" in missing:
+        # no LLM to ask; a resume that never states its experience is scored as a fresher's
+        info["Years of Experience"] = "0"
+    if "Tech Stack" in fields:
+        # scoring reads this key; a resume without recognised skills scores with none
+        info.setdefault("Tech Stack", "")
+
+    return {field: info[field] for field in fields if field in info}
@@ -0,0 +1,112 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+from src.utils.resources import ENCODER_ID
+
+JD_STORE_DIR = Path(os.environ.get("JD_STORE_DIR", Path(__file__).resolve().parents[2] / ".cache" / "jd_profiles"))
+
+
+@dataclass
+class JDProfile:
+    jd_id: str
+    jd_info: dict
+    skills: list
+    embeddings: np.ndarray
+    model: str = ENCODER_ID
+
+    def __getitem__(self, key):
+        return self.jd_info[key]
+
+    def get(self, key, default=None):
+        return self.jd_info.get(key, default)
+
+
+def jd_id_for(jd_text):
+    return hashlib.sha256(" ".join(jd_text.split()).encode("utf-8")).hexdigest()[:16]
+
+
+class JDProfileStore:
+    def __init__(self, root=JD_STORE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._profiles = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, jd_id):
+        return self.root / f"{jd_id}.json", self.root / f"{jd_id}.npy"
+
+    def build(self, jd_id, jd_info):
+        from src.utils.ats import normalize_skills, encode_skills
+        skills = normalize_skills(jd_info["Tech Stack"].split(", "))
+        return JDProfile(jd_id, jd_info, skills, encode_skills(skills))
+
+    def save(self, profile):
+        meta_path, emb_path = self._paths(profile.jd_id)
+        np.save(emb_path, profile.embeddings.astype(np.float32))
+        with open(meta_path, "w") as f:
+            json.dump({"jd_id": profile.jd_id, "model": profile.model, "jd_info": profile.jd_info, "skills": profile.skills}, f)
+        with self._lock:
+            self._profiles[profile.jd_id] = profile
+
+    def register(self, jd_text, jd_info=None):
+        jd_id = jd_id_for(jd_text)
+        if self.get(jd_id) is not None:
+            return jd_id
+        if jd_info is None:
+            from src.utils.parser import extract_jd_skills
+            jd_info = extract_jd_skills(jd_text)
+        self.save(self.build(jd_id, jd_info))
+        return jd_id
+
+    def get(self, jd_id):
+        with self._lock:
+            if jd_id in self._profiles:
+                return self._profiles[jd_id]
+        meta_path, emb_path = self._paths(jd_id)
+        if not meta_path.exists():
+            return None
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta["model"] != ENCODER_ID or not emb_path.exists():
+            # embeddings from another encoder cannot be compared with fresh resume embeddings
+            profile = self.build(jd_id, meta["jd_info"])
+            self.save(profile)
+            return profile
+        profile = JDProfile(jd_id, meta["jd_info"], meta["skills"], np.load(emb_path), meta["model"])
+        with self._lock:
+            self._profiles[jd_id] = profile
+        return profile
+
+    def ids(self):
+        return sorted(path.stem for path in self.root.glob("*.json"))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_jd_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = JDProfileStore()
+    return _store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Register job descriptions for repeated scoring.")
+    parser.add_argument("jd_files", nargs="+", help="text files with job descriptions")
+    args = parser.parse_args(argv)
+    for path in args.jd_files:
+        with open(path, "r") as f:
+            print(path, get_jd_store().register(f.read()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import re
+
+
+def _trie_pattern(node):
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # greedy optional tail: prefer the longest word ending below this node
+    return "(?:" + body + ")?" if "" in node else body
+
+
+def build_trie_pattern(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return _trie_pattern(trie)
+
+
+class LexiconScanner:
+    def __init__(self, lexicons):
+        self.lexicons = {name: list(words) for name, words in lexicons.items()}
+        vocabulary = sorted({word for words in self.lexicons.values() for word in words if word})
+        # every term that matches at a position is a prefix of the longest one matching there
+        self.prefixes = {word: [w for w in vocabulary if word.startswith(w)] for word in vocabulary}
+        self.pattern = re.compile("(?=(" + build_trie_pattern(vocabulary) + "))") if vocabulary else None
+
+    def count_terms(self, lowered):
+        # same numbers as lowered.count(term) for each term, from a single scan
+        counts = dict.fromkeys(self.prefixes, 0)
+        next_free = dict.fromkeys(self.prefixes, 0)
+        if self.pattern is None:
+            return counts
+        for match in self.pattern.finditer(lowered):
+            pos = match.start()
+            for term in self.prefixes[match.group(1)]:
+                if pos >= next_free[term]:
+                    counts[term] += 1
+                    next_free[term] = pos + len(term)
+        return counts
+
+    def totals(self, term_counts):
+        return {name: sum(term_counts.get(word, 0) for word in words) for name, words in self.lexicons.items()}
+
+
+class ResumeFeatures:
+    def __init__(self, text, scanner):
+        self.text = text
+        self.lower = text.lower()
+        self.words = text.split()
+        self.word_count = len(self.words)
+        self.number_count = len([w for w in self.words if any(c.isdigit() for c in w)])
+        self.term_counts = scanner.count_terms(self.lower)
+        self.lexicon_counts = scanner.totals(self.term_counts)
+
+    def mentions(self, term):
+        return term in self.lower
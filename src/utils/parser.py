@@ -1,22 +1,40 @@
 import re
+import io
+import os
+import hashlib
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import PyPDF2
 import json
-from src.llm.kimi_client import call_kimi
+from src.llm.kimi_client import call_kimi, KIMI_MODEL, KIMI_TEMPERATURE
+from src.llm.response_cache import CACHE_ENABLED, cache_key, get_response_cache
+from src.helpers import tracing
+from src.utils.compaction import PAGE_BREAK, compact_resume
 
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
 
-def extract_text_from_pdf(uploaded_file):
-    pdf_reader = PyPDF2.PdfReader(uploaded_file)
-    text = ""
-    for page in pdf_reader.pages:
-        page_content = page.extract_text() + "\n"
-        clean_text =  re.sub(r"^\s*[-*]\s*", "", page_content)
-        clean_text = re.sub(r"[^a-zA-Z0-9\s@,.+]", "", clean_text)
-        text += clean_text
-    return text
+PDF_BACKEND = os.environ.get("PDF_BACKEND", "pypdf2")
+if PDF_BACKEND == "pypdfium2" and pypdfium2 is None:
+    PDF_BACKEND = "pypdf2"
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", os.cpu_count() or 1))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 16))
+PDF_TEXT_CACHE_SIZE = 64
+# what the backends raise for bytes that are not a readable PDF
+PDF_ERRORS = (PyPDF2.errors.PyPdfError,) + ((pypdfium2.PdfiumError,) if pypdfium2 else ())
 
+BULLET_PREFIX = re.compile(r"^\s*[-*]\s*")
+DISALLOWED_CHARS = re.compile(r"[^a-zA-Z0-9\s@,.+]")
 
-def extract_candidate_info(text):
-    prompt = f"""
+_text_cache = OrderedDict()
+_text_cache_lock = threading.Lock()
+_page_pool = None
+
+RESUME_PROMPT = """
     You are an expert Resume Parser. Extract only the following details correctly from this resume text (each in single line):
     - Full Name 
     - Email Address 
@@ -39,19 +57,8 @@ def extract_candidate_info(text):
     {text}
     Answer only the above points each in single sentence. Do not write additional statements. Whole output should be JSON dictionary.
     """
-    raw_output = call_kimi(prompt)
-
-    try:
-        parsed = json.loads(raw_output)
-    except json.JSONDecodeError:
-        cleaned = raw_output.strip("` \n").replace("json\n", "")
-        parsed = json.loads(cleaned)
 
-    return parsed
-
-
-def extract_jd_skills(text):
-    prompt = f"""
+JD_PROMPT = """
     Extract only the following details correctly from this job description (each in single line):
     - Years of Experience (give numerical  result)
     - Desired Position(s) 
@@ -60,14 +67,105 @@ def extract_jd_skills(text):
     {text}
     Answer only the above points each in single sentence. Do not write additional statements. Whole output should be JSON dictionary.
     """
-    raw_output = call_kimi(prompt)
 
+
+def _clean_page(page_content):
+    clean_text = BULLET_PREFIX.sub("", page_content)
+    return DISALLOWED_CHARS.sub("", clean_text)
+
+
+def _page_count(data, backend):
+    if backend == "pypdfium2":
+        return len(pypdfium2.PdfDocument(data))
+    return len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+
+
+def _extract_pages(data, start, stop, backend):
+    if backend == "pypdfium2":
+        pdf = pypdfium2.PdfDocument(data)
+        pages = [pdf[i].get_textpage().get_text_range().replace("\r\n", "\n") for i in range(start, stop)]
+    else:
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        pages = [reader.pages[i].extract_text() for i in range(start, stop)]
+    return [_clean_page(page + "\n") for page in pages]
+
+
+def _read_pdf_bytes(uploaded_file):
+    if isinstance(uploaded_file, (bytes, bytearray)):
+        return bytes(uploaded_file)
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    if hasattr(uploaded_file, "read"):
+        return uploaded_file.read()
+    with open(uploaded_file, "rb") as f:
+        return f.read()
+
+
+def _get_page_pool():
+    global _page_pool
+    with _text_cache_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _page_pool
+
+
+@tracing.traced("extract_text_from_pdf")
+def extract_text_from_pdf(uploaded_file, backend=None, parallel=True):
+    backend = backend or PDF_BACKEND
+    data = _read_pdf_bytes(uploaded_file)
+    key = (hashlib.sha256(data).hexdigest(), backend)
+    with _text_cache_lock:
+        if key in _text_cache:
+            _text_cache.move_to_end(key)
+            tracing.current_span().set(cache_hit=True)
+            return _text_cache[key]
+
+    pages = _page_count(data, backend)
+    tracing.current_span().set(cache_hit=False, pages=pages)
+    if parallel and PDF_WORKERS > 1 and pages >= PDF_PARALLEL_MIN_PAGES:
+        step = -(-pages // PDF_WORKERS)
+        chunks = _get_page_pool().map(_extract_pages, *zip(*[(data, start, min(start + step, pages), backend)
+                                                             for start in range(0, pages, step)]))
+        page_texts = [text for chunk in chunks for text in chunk]
+    else:
+        page_texts = _extract_pages(data, 0, pages, backend)
+    text = PAGE_BREAK.join(page_texts)
+
+    with _text_cache_lock:
+        _text_cache[key] = text
+        while len(_text_cache) > PDF_TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    return text
+
+
+def _parse_json(raw_output):
     try:
         parsed = json.loads(raw_output)
     except json.JSONDecodeError:
         cleaned = raw_output.strip("` \n").replace("json\n", "")
         parsed = json.loads(cleaned)
+    return parsed
 
 
+def extract_with_kimi(template, text):
+    if not CACHE_ENABLED:
+        return _parse_json(call_kimi(template.format(text=text)))
+
+    cache = get_response_cache()
+    key = cache_key(template, KIMI_MODEL, KIMI_TEMPERATURE, text)
+    parsed = cache.get(key)
+    tracing.current_span().set(cache_hit=parsed is not None)
+    if parsed is None:
+        parsed = _parse_json(call_kimi(template.format(text=text)))
+        cache.put(key, parsed)
     return parsed
 
+
+@tracing.traced("extract_candidate_info")
+def extract_candidate_info(text):
+    return extract_with_kimi(RESUME_PROMPT, compact_resume(text))
+
+
+@tracing.traced("extract_jd_skills")
+def extract_jd_skills(text):
+    return extract_with_kimi(JD_PROMPT, text)
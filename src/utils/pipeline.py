@@ -0,0 +1,135 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.parser import extract_text_from_pdf, extract_candidate_info, extract_jd_skills
+from src.utils.ats import normalize_skills, encode_skills, stream_resume_review
+from src.helpers import tracing
+
+PIPELINE_WORKERS = int(os.environ.get("PIPELINE_WORKERS", 16))
+
+# shared by all sessions; branches are mostly waiting on the LLM
+_executor = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="pipeline")
+
+
+def warm_skill_embeddings(info):
+    # fills the embedding cache so scoring finds the vectors ready
+    skills = normalize_skills(str(info.get("Tech Stack") or "").split(", "))
+    if skills:
+        encode_skills(skills)
+    return skills
+
+
+def _submit_warm_up(info):
+    future = _executor.submit(warm_skill_embeddings, info)
+    # a failed warm-up only means scoring encodes the skills itself
+    future.add_done_callback(lambda f: f.exception())
+
+
+def _resume_branch(pdf, extract_text):
+    with tracing.span("resume_branch"):
+        text = extract_text(pdf)
+        info = extract_candidate_info(text)
+    _submit_warm_up(info)
+    return text, info
+
+
+def _jd_branch(jd_text):
+    with tracing.span("jd_branch"):
+        info = extract_jd_skills(jd_text)
+    _submit_warm_up(info)
+    return info
+
+
+class ScreeningJob:
+    # The JD parse starts at once, alongside PDF extraction and the resume parse, so the
+    # wall-clock time is the slower branch rather than the sum of both.
+    def __init__(self, pdf=None, jd_text=None, extract_text=extract_text_from_pdf):
+        self.resume = _executor.submit(_resume_branch, pdf, extract_text) if pdf is not None else None
+        self.jd = _executor.submit(_jd_branch, jd_text) if jd_text else None
+
+    def resume_result(self, timeout=None):
+        return self.resume.result(timeout)
+
+    def jd_result(self, timeout=None):
+        return self.jd.result(timeout)
+
+    def result(self, timeout=None):
+        text, resume_info = self.resume_result(timeout)
+        return text, resume_info, self.jd_result(timeout)
+
+
+def start_screening(pdf, jd_text, extract_text=extract_text_from_pdf):
+    return ScreeningJob(pdf, jd_text, extract_text)
+
+
+def start_jd_profile(jd_text, store=None):
+    # registering a JD means an LLM parse plus encoding its skills; batch scoring starts
+    # extracting and parsing resumes while this runs
+    from src.utils.jd_store import get_jd_store
+    store = store or get_jd_store()
+    return _executor.submit(lambda: store.get(store.register(jd_text)))
+
+
+class _Review:
+    def __init__(self):
+        self.parts = []
+        self.done = False
+        self.error = None
+        self.condition = threading.Condition()
+
+    @property
+    def failed(self):
+        return self.done and self.error is not None
+
+    def text(self):
+        with self.condition:
+            return "".join(self.parts)
+
+    def fill(self, stream, *args):
+        try:
+            for piece in stream(*args):
+                with self.condition:
+                    self.parts.append(piece)
+                    self.condition.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            with self.condition:
+                self.done = True
+                self.condition.notify_all()
+
+    def follow(self):
+        seen = 0
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: len(self.parts) > seen or self.done)
+                pieces, done = self.parts[seen:], self.done
+            seen += len(pieces)
+            yield from pieces
+            if done:
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class ReviewStore:
+    # Reviews shared by all sessions. Each one streams from the LLM on the pipeline pool rather
+    # than in the session's script run, so a rerun that interrupts the page follows the same
+    # review, still streaming or finished, instead of asking the LLM again.
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, candidate_info, jd_info):
+        with self.lock:
+            review = self.entries.get(key)
+            if review is None or review.failed:
+                review = self.entries[key] = _Review()
+                _executor.submit(review.fill, stream_resume_review, candidate_info, jd_info)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        # a finished review is plain text; one still streaming is a generator of its pieces
+        return review.text() if review.done else review.follow()
@@ -0,0 +1,157 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from src.llm.scheduler import BULK
+from src.utils.resources import get_skill_normalizer
+
+QUESTION_BANK_DIR = Path(os.environ.get("QUESTION_BANK_DIR", Path(__file__).resolve().parents[2] / ".cache" / "question_bank"))
+BANK_LOW_WATER = int(os.environ.get("QUESTION_BANK_LOW_WATER", 20))
+BANK_TARGET = int(os.environ.get("QUESTION_BANK_TARGET", 40))
+
+
+def _file_name(skill):
+    # "C" and "C++" would share a slug, so the hash keeps the files apart
+    slug = re.sub(r"[^a-z0-9]+", "_", skill.lower()).strip("_")
+    return f"{slug}-{hashlib.sha1(skill.encode('utf-8')).hexdigest()[:8]}.jsonl"
+
+
+class QuestionBank:
+    # index.json maps each canonical skill to its JSONL file and size; a skill's questions
+    # are read only when that skill is first asked for.
+    def __init__(self, root=QUESTION_BANK_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.json"
+        self.lock = threading.Lock()
+        self.index = {}
+        if self.index_path.exists():
+            with open(self.index_path, "r") as f:
+                self.index = json.load(f)
+        self._questions = {}
+        self._refilling = set()
+        self._refill_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="question-bank")
+
+    def size(self, skill):
+        entry = self.index.get(skill)
+        return entry["count"] if entry else 0
+
+    def skills(self):
+        return sorted(self.index)
+
+    def questions(self, skill):
+        with self.lock:
+            return list(self._load(skill))
+
+    def _load(self, skill):
+        if skill not in self._questions:
+            entry = self.index.get(skill)
+            questions = []
+            if entry and (self.root / entry["file"]).exists():
+                with open(self.root / entry["file"], "r") as f:
+                    for line in f:
+                        try:
+                            questions.append(json.loads(line)["question"])
+                        except (json.JSONDecodeError, KeyError):
+                            # a line cut short by an interrupted write
+                            continue
+            self._questions[skill] = questions
+        return self._questions[skill]
+
+    def sample(self, skill, avoid=(), rng=random):
+        from src.utils.assessment import is_duplicate_question
+        with self.lock:
+            pool = [q for q in self._load(skill) if q not in avoid]
+        rng.shuffle(pool)
+        for question in pool:
+            if not is_duplicate_question(question, avoid):
+                return question
+        return None
+
+    def add(self, skill, questions):
+        from src.utils.assessment import is_duplicate_question
+        with self.lock:
+            existing = self._load(skill)
+            fresh = []
+            for question in questions:
+                question = question.strip() if question else ""
+                if question and not is_duplicate_question(question, existing + fresh):
+                    fresh.append(question)
+            if not fresh:
+                return 0
+            entry = self.index.setdefault(skill, {"file": _file_name(skill), "count": 0})
+            with open(self.root / entry["file"], "a") as f:
+                for question in fresh:
+                    f.write(json.dumps({"question": question}) + "\n")
+            existing.extend(fresh)
+            entry["count"] = len(existing)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self.index, f, indent=1)
+            os.replace(tmp_path, self.index_path)
+            return len(fresh)
+
+    def refill(self, skill, target=BANK_TARGET, max_attempts=None):
+        from src.utils.assessment import generate_technical_questions
+        attempts = 0
+        max_attempts = max_attempts or 2 * target
+        while self.size(skill) < target and attempts < max_attempts:
+            attempts += 1
+            known = self.questions(skill)
+            try:
+                # no candidate waits on a top-up, so it queues behind live questions and grades
+                question = generate_technical_questions(skill, len(known) + 1, focus=skill, avoid=known[-15:],
+                                                        priority=BULK)
+            except Exception:
+                break
+            self.add(skill, [question])
+        return self.size(skill)
+
+    def request_refill(self, skill):
+        # skills outside the normalizer are not banked; they always go to the LLM
+        if skill not in get_skill_normalizer() or self.size(skill) >= BANK_LOW_WATER:
+            return None
+        with self.lock:
+            if skill in self._refilling:
+                return None
+            self._refilling.add(skill)
+
+        def run():
+            try:
+                return self.refill(skill)
+            finally:
+                with self.lock:
+                    self._refilling.discard(skill)
+        return self._refill_pool.submit(run)
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank():
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuestionBank()
+    return _bank
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate interview questions for canonical skills.")
+    parser.add_argument("skills", nargs="*", help="canonical skills to fill (default: every skill in the normalizer)")
+    parser.add_argument("--target", type=int, default=BANK_TARGET, help="questions to hold per skill")
+    args = parser.parse_args(argv)
+    bank = get_question_bank()
+    for skill in args.skills or list(get_skill_normalizer()):
+        print(skill, bank.refill(skill, args.target))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+SBERT_MODEL_NAME = "all-MiniLM-L6-v2"
+SBERT_BACKEND = os.environ.get("SBERT_BACKEND", "torch")
+# vectors from different backends differ slightly, so caches and stored profiles are keyed by both
+ENCODER_ID = SBERT_MODEL_NAME if SBERT_BACKEND == "torch" else f"{SBERT_MODEL_NAME}@{SBERT_BACKEND}"
+PRELOAD_RESOURCES = os.environ.get("PRELOAD_RESOURCES", "0") == "1"
+
+_resources = {}
+_locks = {}
+_locks_guard = threading.Lock()
+_warm_up_thread = None
+
+
+def load_once(name, loader):
+    if name in _resources:
+        return _resources[name]
+    with _locks_guard:
+        lock = _locks.setdefault(name, threading.Lock())
+    with lock:
+        if name not in _resources:
+            _resources[name] = loader()
+    return _resources[name]
+
+
+def _read_json(filename):
+    with open(DATA_DIR / filename, "r") as f:
+        return json.load(f)
+
+
+def get_skill_normalizer():
+    return load_once("skill_normalizer", lambda: _read_json("skill_normalizer.json"))
+
+
+def get_verbs():
+    return load_once("verbs", lambda: _read_json("verbs.json"))
+
+
+def get_skill_index():
+    from src.utils.skill_index import SkillIndex
+    return load_once("skill_index", lambda: SkillIndex(get_skill_normalizer()))
+
+
+def get_lexicon_scanner():
+    from src.utils.lexicon import LexiconScanner
+    return load_once("lexicon_scanner", lambda: LexiconScanner(get_verbs()))
+
+
+def load_sbert_model(backend=SBERT_BACKEND, model_name=SBERT_MODEL_NAME):
+    if backend not in ("torch", "onnx", "int8"):
+        raise ValueError(f"unknown SBERT_BACKEND {backend!r}, expected torch, onnx or int8")
+    from sentence_transformers import SentenceTransformer
+    from src.utils.encoder import ENCODER_THREADS
+    import torch
+    if ENCODER_THREADS:
+        torch.set_num_threads(ENCODER_THREADS)
+    if backend == "onnx":
+        # needs the onnx extra: pip install sentence-transformers[onnx]
+        return SentenceTransformer(model_name, backend="onnx")
+    model = SentenceTransformer(model_name)
+    if backend == "int8":
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def get_sbert_model():
+    return load_once("sbert_model", load_sbert_model)
+
+
+def get_encoder():
+    # the model behind a micro-batching front, unless ENCODER_BATCHING=0
+    from src.utils.encoder import ENCODER_BATCHING, BatchingEncoder
+    if not ENCODER_BATCHING:
+        return get_sbert_model()
+    return load_once("encoder", lambda: BatchingEncoder(get_sbert_model()))
+
+
+def _open_embedding_cache():
+    from src.utils.embedding_cache import EmbeddingCache
+    from src.llm import metrics
+    cache = EmbeddingCache(ENCODER_ID)
+    # hits and misses show up on /metrics
+    metrics.register_collector(cache.counters)
+    return cache
+
+
+def get_embedding_cache():
+    return load_once("embedding_cache", _open_embedding_cache)
+
+
+def warm_up(background=False):
+    def load_all():
+        get_skill_normalizer()
+        get_verbs()
+        get_skill_index()
+        get_lexicon_scanner()
+        get_embedding_cache()
+        get_encoder()
+
+    global _warm_up_thread
+    if background:
+        with _locks_guard:
+            if _warm_up_thread is None:
+                _warm_up_thread = threading.Thread(target=load_all, name="resource-warm-up", daemon=True)
+                _warm_up_thread.start()
+        return _warm_up_thread
+    load_all()
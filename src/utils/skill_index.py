@@ -0,0 +1,38 @@
+import numpy as np
+from rapidfuzz import process, fuzz
+
+
+class SkillIndex:
+    def __init__(self, normalizer, fuzzy_cutoff=80):
+        self.fuzzy_cutoff = fuzzy_cutoff
+
+        # exact lookups: first canonical entry wins, same order as the JSON file
+        self.exact = {}
+        for canonical, aliases in normalizer.items():
+            self.exact.setdefault(canonical.lower(), canonical)
+            for alias in aliases:
+                self.exact.setdefault(alias.lower(), canonical)
+
+        # fuzzy lookups: aliases only, later entries override earlier ones
+        fuzzy = {alias.lower(): canonical for canonical, aliases in normalizer.items() for alias in aliases}
+        self.choices = list(fuzzy.keys())
+        self.targets = list(fuzzy.values())
+
+    def lookup(self, skill):
+        return self.normalize([skill])[0]
+
+    def normalize(self, skills):
+        keys = [skill.lower().strip() for skill in skills]
+        result = [self.exact.get(key) for key in keys]
+
+        misses = [i for i, canonical in enumerate(result) if canonical is None]
+        if misses and self.choices:
+            scores = process.cdist([keys[i] for i in misses], self.choices, scorer=fuzz.WRatio,
+                                   dtype=np.float64, workers=-1)
+            best = scores.argmax(axis=1)
+            for row, i in enumerate(misses):
+                col = best[row]
+                if scores[row, col] > self.fuzzy_cutoff:
+                    result[i] = self.targets[col]
+
+        return [canonical if canonical is not None else skill for skill, canonical in zip(skills, result)]
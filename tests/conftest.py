@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT), str(ROOT / "benchmarks")]
+
+from mock_llm_server import start_server
+
+# one local stand-in for the Groq/OpenAI endpoint; the clients read its address at import
+_mock = start_server(latency=0.0)
+_scratch = tempfile.mkdtemp(prefix="tests-")
+os.environ.update({
+    "GROQ_BASE_URL": _mock.base_url,
+    "GROQ_API": "test",
+    "LLM_CACHE": "0",
+    "LLM_MAX_RETRIES": "2",
+    "EMBEDDING_CACHE_DIR": str(Path(_scratch) / "embeddings"),
+    "JD_STORE_DIR": str(Path(_scratch) / "jd_profiles"),
+    "QUESTION_BANK_DIR": str(Path(_scratch) / "question_bank"),
+})
+
+
+@pytest.fixture
+def mock_llm():
+    options = dict(_mock.options)
+    yield _mock
+    _mock.options.update(options)
+
+
+@pytest.fixture
+def stub_model():
+    # offline embeddings and readability, so scoring runs without the SBERT weights or nltk data
+    from stand_ins import StubEmbeddingModel, ensure_readability
+    from src.utils import resources
+    previous = resources._resources.get("sbert_model")
+    resources._resources["sbert_model"] = StubEmbeddingModel()
+    ensure_readability()
+    yield
+    if previous is None:
+        resources._resources.pop("sbert_model", None)
+    else:
+        resources._resources["sbert_model"] = previous
@@ -0,0 +1,82 @@
+from concurrent.futures import Future
+import pytest
+from src.llm import scheduler
+from src.llm.scheduler import INTERACTIVE, BULK
+from src.utils.assessment import generate_technical_questions, resolve_grade
+from src.utils.question_bank import QuestionBank
+
+
+@pytest.fixture
+def priorities(monkeypatch):
+    seen = []
+    acquire = scheduler.LLMScheduler.acquire
+
+    def record(self, model, tokens, priority=None):
+        seen.append(scheduler._priority.get() if priority is None else priority)
+        return acquire(self, model, tokens, priority)
+    monkeypatch.setattr(scheduler.LLMScheduler, "acquire", record)
+    return seen
+
+
+def test_live_questions_are_interactive(mock_llm, priorities):
+    generate_technical_questions("Python", 1)
+    assert priorities == [INTERACTIVE]
+
+
+def test_bank_refill_runs_at_bulk_priority(tmp_path, mock_llm, priorities):
+    bank = QuestionBank(tmp_path)
+    bank.refill("Python", target=3)
+    assert priorities and set(priorities) == {BULK}
+
+
+def test_unbanked_skill_is_asked_about_itself(tmp_path, monkeypatch, stub_model):
+    from src.utils import assessment
+    bank = QuestionBank(tmp_path)
+    bank.add("Python", ["What is a Python generator?", "How do Python decorators work?"])
+    bank.add("SQL", ["When would you use a SQL window function?", "What does a SQL index speed up?"])
+    monkeypatch.setattr(bank, "request_refill", lambda skill: None)
+    monkeypatch.setattr(assessment, "get_question_bank", lambda: bank)
+    prompts = []
+
+    def fake_llm(prompt, coalesce=True):
+        prompts.append(prompt)
+        return f"Question {len(prompts)} from the LLM?"
+    monkeypatch.setattr(assessment, "call_llama", fake_llm)
+
+    # "py" is an alias of Python; the third slot belongs to Docker, which has nothing banked
+    prefetcher = assessment.QuestionPrefetcher("Python, py, SQL, Docker")
+    questions = [prefetcher.get(n) for n in range(1, 6)]
+    assert len(prompts) == 1
+    assert "Focus this question on Docker." in prompts[0]
+    assert questions[2] == "Question 1 from the LLM?"
+
+
+def resolved(raw_output):
+    job = Future()
+    job.set_result(raw_output)
+    return resolve_grade(job)
+
+
+def test_fenced_grade_is_parsed():
+    grade, error = resolved('```json\n{"score": "80", "feedback": "Good."}\n```')
+    assert error is None
+    assert grade == {"score": 80.0, "feedback": "Good."}
+
+
+@pytest.mark.parametrize("raw_output", [
+    '{"feedback": "No score."}',
+    '{"score": 70}',
+    '{"score": "eighty", "feedback": "Words, not a number."}',
+    '["score", 70]',
+    "I would give this answer 70.",
+])
+def test_unusable_grade_is_an_error_not_a_crash(raw_output):
+    grade, error = resolved(raw_output)
+    assert grade is None
+    assert error
+
+
+def test_failed_grading_call_is_an_error():
+    job = Future()
+    job.set_exception(TimeoutError("LLM did not answer"))
+    assert resolve_grade(job) == (None, "TimeoutError: LLM did not answer")
@@ -0,0 +1,22 @@
+import json
+from src import batch
+
+
+def fake_score_one(self, path):
+    return {"file": str(path), "jd_id": self.jd_id, "ats_score": 50}
+
+
+def test_resume_after_a_crash_mid_line(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch.BatchScorer, "score_one", fake_score_one)
+    out = tmp_path / "scores.jsonl"
+    # the first run died while writing b.pdf's record
+    out.write_text(json.dumps({"file": "a.pdf", "ats_score": 40}) + "\n" + '{"file": "b.pdf", "ats_sc')
+
+    batch.run_batch(None, ["a.pdf", "b.pdf", "c.pdf"], out, workers=1, llm_concurrency=1, jd_id="jd")
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted(record["file"] for record in records) == ["a.pdf", "b.pdf", "c.pdf"]
+    assert batch.load_completed(out) == {"a.pdf", "b.pdf", "c.pdf"}
+
+    # nothing is left to rescore on the next resume
+    batch.run_batch(None, ["a.pdf", "b.pdf", "c.pdf"], out, workers=1, llm_concurrency=1, jd_id="jd")
+    assert len(out.read_text().splitlines()) == 3
@@ -0,0 +1,50 @@
+import numpy as np
+from src.utils.candidate_index import CandidateIndex
+
+
+def ones(skills):
+    return np.ones((len(skills), 4), dtype=np.float32)
+
+
+def ramp(skills):
+    return np.array([[i + 1, 0, 0, 1] for i in range(len(skills))], dtype=np.float32)
+
+
+def test_encoder_switch_reembeds_vocab(tmp_path):
+    index = CandidateIndex(tmp_path, 4, model="torch")
+    index.add_skills("c1", ["Python", "SQL"], ones)
+    index.add_skills("c2", ["SQL", "Go"], ones)
+
+    same = CandidateIndex(tmp_path, 4, model="torch", encode=ramp)
+    assert np.allclose(same.vocab_vectors, 0.5)
+
+    switched = CandidateIndex(tmp_path, 4, model="onnx", encode=ramp)
+    assert np.allclose(switched.vocab_vectors[:, 1:3], 0)
+    assert not np.allclose(switched.vocab_vectors[0], switched.vocab_vectors[1])
+    assert switched.skills_of("c2") == ["SQL", "Go"]
+
+    # stored vectors and records now belong to the new encoder
+    switched.compact()
+    reopened = CandidateIndex(tmp_path, 4, model="onnx", encode=ones)
+    assert np.allclose(reopened.vocab_vectors, switched.vocab_vectors)
+    assert len(reopened) == 2
+
+
+def test_shortlist_skips_candidates_without_details(tmp_path, stub_model):
+    from src.utils.ats import encode_skills
+    index = CandidateIndex(tmp_path)
+    resume = {"Tech Stack": "Python, SQL", "Years of Experience": "2"}
+    index.add("full", resume, "Developed Python services and SQL pipelines.")
+    index.add("gone", resume, "Developed Python services.")
+    index.add_skills("bare", ["Python", "SQL"], encode_skills)
+
+    rank = index.rank
+
+    def rank_then_remove(*args):
+        # a removal that lands between ranking and the detail lookup
+        ranked = rank(*args)
+        index.remove("gone")
+        return ranked
+    index.rank = rank_then_remove
+    results = index.shortlist({"Tech Stack": "Python, SQL", "Years of Experience": "1"})
+    assert [r["id"] for r in results] == ["full"]
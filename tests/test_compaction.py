@@ -0,0 +1,31 @@
+from prompt_compaction import synthetic_resume
+from src.utils.compaction import PAGE_BREAK, approx_tokens, clean_lines, compact_resume
+
+HEADER = "Jane Doe\njane.doe@example.com 5551234567\nBengaluru"
+
+
+def test_clean_lines_keeps_contact_details_and_drops_footers():
+    pages = [f"{HEADER}\nExperience\n2022\n- Built pipelines\n- Shipped dashboards\n- Led a team\nPage {n} of 2"
+             for n in (1, 2)]
+    pages[1] += "\nDeclaration\nI hereby declare that the above information is true to the best of my knowledge."
+    lines = clean_lines(PAGE_BREAK.join(pages))
+    # the running header stays once; lines repeated inside the body are content
+    assert lines.count("jane.doe@example.com 5551234567") == 1
+    assert lines.count("2022") == 2
+    assert not any(line.startswith("Page ") for line in lines)
+    assert not any("declare" in line.lower() or line == "Declaration" for line in lines)
+
+
+def test_resume_within_budget_is_sent_as_is():
+    text = f"{HEADER}\nPage 1 of 1"
+    assert compact_resume(text, budget=100) == text
+
+
+def test_long_resume_keeps_contacts_and_skills():
+    text = synthetic_resume(8, 8)
+    compacted = compact_resume(text, budget=1500)
+    assert approx_tokens(compacted) <= 1500 < approx_tokens(text)
+    assert "jane.doe@example.com 5551234567" in compacted
+    assert "Python, SQL, PyTorch, Docker, AWS, NLP" in compacted
+    assert "Page 1 of 8" not in compacted
+    assert "hereby declare" not in compacted
@@ -0,0 +1,61 @@
+import json
+import numpy as np
+from src.utils import embedding_cache
+from src.utils.embedding_cache import EmbeddingCache
+
+
+def encode(texts):
+    # a vector that identifies its text, so a row mix-up shows
+    return np.array([[len(text), sum(map(ord, text)), 1] for text in texts], dtype=np.float32)
+
+
+def test_misses_append_keys_and_fold_them_into_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "COMPACT_MIN_KEYS", 4)
+    first = EmbeddingCache("m", tmp_path)
+    second = EmbeddingCache("m", tmp_path)
+
+    first.get_many(["python", "sql"], encode)
+    index = json.loads((first.path / "index.json").read_text())
+    before = first.log_path.read_text()
+    # another process sees those keys, and only appends its own
+    second.get_many(["sql", "docker"], encode)
+    assert first.log_path.read_text().startswith(before)
+    assert json.loads((first.path / "index.json").read_text()) == index
+    assert second.stats()["disk_items"] == 3
+
+    first.get_many(["go", "rust", "java"], encode)
+    assert first.log_path.read_text() == ""
+    assert len(json.loads((first.path / "index.json").read_text())["rows"]) == 6
+
+    reopened = EmbeddingCache("m", tmp_path)
+    texts = ["python", "sql", "docker", "go", "rust", "java"]
+    assert np.array_equal(reopened.get_many(texts, lambda texts: 1 / 0), encode(texts))
+    assert reopened.stats()["disk_hits"] == 6
+
+
+def test_interrupted_flush_is_dropped(tmp_path):
+    cache = EmbeddingCache("m", tmp_path)
+    cache.get_many(["python"], encode)
+    cache.get_many(["sql"], encode)
+    # a flush that wrote its vector but only half its key
+    with open(cache.vectors_path, "ab") as f:
+        f.write(encode(["docker"]).tobytes())
+    with open(cache.log_path, "a") as f:
+        f.write("abc")
+
+    reopened = EmbeddingCache("m", tmp_path)
+    assert reopened.stats()["disk_items"] == 2
+    assert np.array_equal(reopened.get_many(["docker", "sql"], encode), encode(["docker", "sql"]))
+    assert EmbeddingCache("m", tmp_path).stats()["disk_items"] == 3
+
+
+def test_hits_and_misses_reach_the_metrics(tmp_path):
+    from src.helpers import tracing
+    from src.llm import metrics
+    cache = EmbeddingCache("metrics-test", tmp_path)
+    metrics.register_collector(cache.counters)
+    cache.get_many(["python", "sql"], encode)
+    cache.get_many(["python"], encode)
+    text = tracing.render_prometheus()
+    assert 'embedding_cache_lookups_total{model="metrics-test",result="miss"} 2' in text
+    assert 'embedding_cache_lookups_total{model="metrics-test",result="memory_hit"} 1' in text
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+from src.utils.encoder import BatchingEncoder
+
+
+class FlakyModel:
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            raise KeyboardInterrupt
+        return np.ones((len(texts), 3), dtype=np.float32)
+
+
+def test_worker_survives_base_exception():
+    encoder = BatchingEncoder(FlakyModel(), max_wait_ms=0)
+    with pytest.raises(KeyboardInterrupt):
+        encoder.encode(["python"])
+    assert encoder.encode(["sql", "go"]).shape == (2, 3)
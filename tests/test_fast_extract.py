@@ -0,0 +1,22 @@
+from pathlib import Path
+from src.utils.fast_extract import RULE_FIELDS, extract_candidate_info_fast
+
+RESUME = (Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures" / "resumes" / "01_ml_engineer.txt").read_text()
+
+
+def test_default_fields_skip_the_llm_when_rules_fill_them(mock_llm):
+    before = mock_llm.requests
+    info = extract_candidate_info_fast(RESUME)
+    assert list(info) == RULE_FIELDS
+    assert info["Email Address"] == "priya.sharma@gmail.com"
+    assert "PyTorch" in info["Tech Stack"]
+    assert mock_llm.requests == before
+
+
+def test_only_missing_fields_go_to_the_llm(mock_llm):
+    before = mock_llm.requests
+    info = extract_candidate_info_fast(RESUME.replace("priya.sharma@gmail.com", ""))
+    assert mock_llm.requests - before == 1
+    # the mock answers every resume parse with the same canned reply
+    assert info["Email Address"] == "jane.doe@example.com"
+    assert info["Full Name"] == "Priya Sharma"
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import openai
+import pytest
+from src.llm import pool
+from src.llm.kimi_client import call_kimi, acall_kimi
+from src.llm.llama_client import call_llama, acall_llama, stream_llama
+from src.llm.scheduler import get_scheduler
+
+REVIEW_PROMPT = "Write a short review of this candidate."
+
+
+def test_sync_clients_share_one_pool(mock_llm):
+    before = mock_llm.requests
+    parsed = json.loads(call_kimi("You are an expert Resume Parser. Resume Text: ..."))
+    assert parsed["Email Address"] == "jane.doe@example.com"
+    assert call_llama(REVIEW_PROMPT).startswith("Strengths:")
+    assert mock_llm.requests - before == 2
+    assert pool.get_groq_client() is pool.get_groq_client()
+    assert pool.get_openai_client() is pool.get_openai_client()
+
+
+def test_async_clients_run_concurrently_on_one_loop(mock_llm):
+    mock_llm.options["latency"] = 0.2
+
+    async def run():
+        replies = await asyncio.gather(*[acall_llama(f"{REVIEW_PROMPT} #{i}") for i in range(8)],
+                                       acall_kimi("You are an expert Resume Parser. Resume Text: ..."))
+        return replies, pool.get_async_openai_client() is pool.get_async_openai_client()
+
+    loop = asyncio.new_event_loop()
+    try:
+        start = loop.time()
+        replies, shared = loop.run_until_complete(run())
+        elapsed = loop.time() - start
+    finally:
+        loop.close()
+    assert shared
+    assert all(reply.startswith("Strengths:") for reply in replies[:8])
+    assert json.loads(replies[8])["Full Name"] == "Jane Doe"
+    # nine calls at 0.2 s each would take 1.8 s one after another
+    assert elapsed < 1.0
+
+
+def test_stream_llama_yields_the_whole_reply(mock_llm):
+    pieces = list(stream_llama(REVIEW_PROMPT))
+    assert len(pieces) > 1
+    assert "".join(pieces).startswith("Strengths:")
+
+
+@pytest.mark.parametrize("option, error", [
+    ("rate_limit_rate", openai.RateLimitError),
+    ("error_rate", openai.InternalServerError),
+])
+def test_failures_are_retried_then_raised(mock_llm, option, error):
+    mock_llm.options[option] = 1.0
+    before = mock_llm.requests
+    with pytest.raises(error):
+        call_llama(f"{REVIEW_PROMPT} ({option})")
+    # the first attempt plus LLM_MAX_RETRIES=2 retries
+    assert mock_llm.requests - before == 3
+    assert not get_scheduler().in_flight
+
+
+def test_questions_are_not_coalesced_across_sessions(mock_llm):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.utils.assessment import generate_technical_questions
+    mock_llm.options["latency"] = 0.2
+    before = mock_llm.requests
+    with ThreadPoolExecutor(2) as sessions:
+        questions = list(sessions.map(lambda _: generate_technical_questions("Python", 1), range(2)))
+    assert mock_llm.requests - before == 2
+    assert questions[0] != questions[1]
+
+
+def test_identical_async_prompts_share_one_call(mock_llm):
+    mock_llm.options["latency"] = 0.2
+    before = mock_llm.requests
+
+    async def run():
+        return await asyncio.gather(*[acall_llama(f"{REVIEW_PROMPT} (async coalesce)") for _ in range(4)])
+
+    replies = asyncio.run(run())
+    assert len(set(replies)) == 1
+    assert mock_llm.requests - before == 1
+    assert not get_scheduler().in_flight
+
+
+@pytest.fixture
+def charges(monkeypatch):
+    from src.llm.scheduler import LLMScheduler
+    seen = []
+    monkeypatch.setattr(LLMScheduler, "charge", lambda self, model, estimated, used: seen.append(used))
+    return seen
+
+
+def test_streamed_call_is_charged_its_usage(mock_llm, charges):
+    text = "".join(stream_llama(REVIEW_PROMPT))
+    assert charges == [max(1, len(REVIEW_PROMPT) // 4) + max(1, len(text) // 4)]
+
+
+def test_abandoned_stream_is_charged_what_it_received(mock_llm, charges):
+    stream = stream_llama(REVIEW_PROMPT)
+    first = next(stream)
+    stream.close()
+    assert charges == [len(REVIEW_PROMPT) // 4 + len(first) // 4]
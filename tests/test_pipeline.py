@@ -0,0 +1,35 @@
+import openai
+import pytest
+from src.utils.pipeline import ReviewStore
+
+RESUME = {"Tech Stack": "Python, SQL", "Years of Experience": "2"}
+JD = {"Tech Stack": "Python, SQL, Docker", "Years of Experience": "1"}
+
+
+def test_interrupted_review_is_not_requested_again(mock_llm):
+    mock_llm.options["token_latency"] = 0.01
+    store = ReviewStore()
+    before = mock_llm.requests
+
+    first = store.get("k", RESUME, JD)
+    assert next(first)
+    # Streamlit stops the script run and drops the stream part way through
+    first.close()
+
+    second = store.get("k", RESUME, JD)
+    text = second if isinstance(second, str) else "".join(second)
+    assert text.startswith("Strengths:")
+    assert store.get("k", RESUME, JD) == text
+    assert mock_llm.requests - before == 1
+
+
+def test_failed_review_is_retried(mock_llm):
+    mock_llm.options["error_rate"] = 1.0
+    store = ReviewStore(max_entries=1)
+    with pytest.raises(openai.InternalServerError):
+        "".join(store.get("k", RESUME, JD))
+
+    mock_llm.options["error_rate"] = 0.0
+    assert "".join(store.get("k", RESUME, JD)).startswith("Strengths:")
+    store.get("other", RESUME, JD)
+    assert list(store.entries) == ["other"]
@@ -0,0 +1,55 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.llm import scheduler
+from src.llm.scheduler import LLMScheduler, INTERACTIVE, BULK
+
+
+class NoThreads(ThreadPoolExecutor):
+    def submit(self, *args, **kwargs):
+        raise AssertionError("the wait was handed to a thread")
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    # two requests up front, then one every 0.05 s
+    monkeypatch.setattr(scheduler, "LLM_LIMITS", {"m": [1200, 0]})
+    sched = LLMScheduler()
+    sched._queue("m").requests.level = 2
+    return sched
+
+
+def test_async_waits_do_not_hold_threads(limited):
+    order = []
+
+    async def call(name, priority):
+        await limited.aacquire("m", 10, priority)
+        order.append(name)
+
+    async def run():
+        asyncio.get_running_loop().set_default_executor(NoThreads())
+        await asyncio.gather(*[call(f"bulk{i}", BULK) for i in range(4)], call("interactive", INTERACTIVE))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start >= 0.1
+    # the interactive call jumps every bulk call still waiting
+    assert order.index("interactive") <= 2
+    assert limited.stats()["models"]["m"] == {"queue_depth": 0, "throttled": 3, "dispatched": 5}
+
+
+def test_cancelled_async_wait_leaves_the_queue(limited):
+    limited._queue("m").requests.level = 0
+
+    async def run():
+        waiting = asyncio.ensure_future(limited.aacquire("m", 10, INTERACTIVE))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+    asyncio.run(run())
+    assert limited.stats()["models"]["m"]["queue_depth"] == 0
+    # a later caller is not stuck behind the cancelled ticket
+    limited.acquire("m", 10)
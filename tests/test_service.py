@@ -0,0 +1,108 @@
+import base64
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from src.service import ScoringService, make_server
+
+RESUME = ("Education: B.Tech in Computer Science. Experience: developed and deployed Python services, "
+          "improved latency by 30 percent, led a team of four. ") * 12
+JD = "Machine Learning Engineer, 1+ years. Required: Python, SQL, TensorFlow, Kubernetes, GCP."
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**options):
+        server = make_server(port=0, service=ScoringService(**options))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def post(url, body):
+    data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+    request = urllib.request.Request(url, data, {"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read()), response.headers
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read()), e.headers
+
+
+def test_parse_resume_and_jd(serve, mock_llm):
+    url = serve()
+    status, body, _ = post(url + "/parse", {"resume_text": RESUME, "jd_text": JD})
+    assert status == 200
+    assert body["resume"]["Full Name"] == "Jane Doe"
+    assert "Python" in body["jd"]["Tech Stack"]
+
+
+def test_score(serve, mock_llm, stub_model):
+    url = serve()
+    status, body, _ = post(url + "/score", {"resume_text": RESUME, "jd_text": JD})
+    assert status == 200
+    assert 0 <= body["ats_score"] <= 100
+    assert "Python" in body["breakdown"]["Matched Skills"]
+
+
+def test_batch_larger_than_max_pending_is_admitted(serve, mock_llm, stub_model):
+    url = serve(workers=4, max_pending=8)
+    resumes = [{"id": i, "text": RESUME} for i in range(20)]
+    status, body, _ = post(url + "/batch-score", {"jd_text": JD, "resumes": resumes})
+    assert status == 200
+    assert [r["id"] for r in body["results"]] == list(range(20))
+    assert all("ats_score" in r for r in body["results"])
+
+
+def test_bad_batch_item_does_not_fail_batch(serve, mock_llm, stub_model):
+    url = serve()
+    resumes = [{"id": "ok", "text": RESUME}, {"id": "bad"}]
+    status, body, _ = post(url + "/batch-score", {"jd_text": JD, "resumes": resumes})
+    assert status == 200
+    assert "ats_score" in body["results"][0]
+    assert body["results"][1]["status"] == 400
+
+
+@pytest.mark.parametrize("payload", [
+    {"resume_pdf_base64": "not base64!", "jd_text": JD},
+    {"resume_pdf_base64": base64.b64encode(b"plain text, not a pdf").decode(), "jd_text": JD},
+])
+def test_undecodable_pdf_is_a_client_error(serve, payload):
+    status, body, _ = post(serve() + "/score", payload)
+    assert status == 400
+    assert "resume_pdf_base64" in body["error"]
+
+
+def test_invalid_body(serve):
+    url = serve()
+    assert post(url + "/parse", b"\xff\xfe{")[0] == 400
+    assert post(url + "/parse", b"[1, 2]")[0] == 400
+    assert post(url + "/parse", {})[0] == 400
+    assert post(url + "/nowhere", {})[0] == 404
+
+
+def test_full_queue_gets_503(serve, mock_llm):
+    mock_llm.options["latency"] = 0.5
+    url = serve(workers=1, max_pending=1)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(post(url + "/parse", {"jd_text": JD}))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    statuses = sorted(status for status, _, _ in results)
+    assert statuses[0] == 200 and statuses[-1] == 503
+    assert [headers["Retry-After"] for status, _, headers in results if status == 503] == ["1"] * statuses.count(503)
+
+
+def test_slow_request_gets_504(serve, mock_llm):
+    mock_llm.options["latency"] = 1.0
+    status, body, _ = post(serve(timeout=0.2) + "/parse", {"jd_text": JD})
+    assert status == 504
@@ -0,0 +1,27 @@
+import pytest
+from src.helpers import tracing
+from src.utils.ats import stream_resume_review
+
+
+@pytest.fixture
+def traced():
+    tracing.enable()
+    tracing.reset()
+    yield
+    tracing.enable(False)
+    tracing.reset()
+
+
+def test_abandoned_review_stream_leaves_no_current_span(traced, mock_llm):
+    stream = stream_resume_review({"Tech Stack": "Python"}, {"Tech Stack": "Python, SQL"})
+    assert next(stream)
+    # the caller's code between yields is not inside the review span
+    assert tracing.current_span() is tracing._NOOP
+    with tracing.span("rerun") as rerun:
+        assert tracing.current_span() is rerun
+
+    stream.close()
+    assert tracing.current_span() is tracing._NOOP
+    review = next(span for span in tracing.recent_spans() if span["name"] == "generate_resume_review")
+    assert review["error"] == "GeneratorExit"
+    assert next(span for span in tracing.recent_spans() if span["name"] == "rerun")["parent_id"] is None